@@ -0,0 +1,188 @@
+# Benchmark das etapas da conversão (leitura, transformação e serialização)
+# Gera uma planilha sintética no tamanho pedido, mede cada etapa em um processo
+# próprio (para que o pico de memória seja o da etapa) e acrescenta o resultado a
+# um arquivo JSON, para comparar versões.
+# Uso (na raiz do repositório):
+#   python -m benchmarks.bench_pipeline --rows 50000 --groups 3 --list-length 20
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from conversao_json.converter import build_envelope, generate_json_from_excel
+from conversao_json.engine import CHUNK_SIZE, frame_from_rows, iter_normalized_rows, normalize_offers_frame
+from conversao_json.plan import convert_columns_to_list
+from conversao_json.reader import iter_offers, iter_sheet_rows, read_excel_to_dict
+from conversao_json.schema import SCHEMA_VERSION, get_builder
+from conversao_json.writer import OffersJsonWriter
+
+from .synthetic import write_workbook
+
+# Histórico local de cada máquina, fora do controle de versão (ver .gitignore)
+DEFAULT_RESULTS = os.path.join(os.path.dirname(__file__), "results.json")
+
+
+# Função para o pico de memória residente do processo atual, em MB (None fora do Unix)
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return round(peak / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+
+
+# Etapas medidas; cada uma recebe o caminho da planilha, prepara sua entrada fora do
+# cronômetro e retorna (segundos, ofertas processadas)
+
+def phase_read_pandas(path):
+    start = time.perf_counter()
+    count = len(read_excel_to_dict(path)["offers"])
+    return time.perf_counter() - start, count
+
+
+def phase_read_streaming(path):
+    start = time.perf_counter()
+    count = sum(1 for _ in iter_sheet_rows(path)) - 1
+    return time.perf_counter() - start, count
+
+
+def phase_columns_to_list(path):
+    offers = list(iter_offers(path))
+    start = time.perf_counter()
+    for offer in offers:
+        convert_columns_to_list(offer, ["formaPagamento", "descontoPagamento"])
+        convert_columns_to_list(offer, ["descricaoPromocao", "tempoDesconto", "descontoPromocao"])
+        convert_columns_to_list(offer, ["valorRecarga", "validadeRecarga", "beneficioRecarga"])
+        convert_columns_to_list(offer, ["tipo", "numeroPontos", "pontoAdicional"])
+    return time.perf_counter() - start, len(offers)
+
+
+def phase_transform(path):
+    raw_rows = iter_sheet_rows(path)
+    header = next(raw_rows)
+    raw_rows = list(raw_rows)
+
+    # Normalização em blocos (engine) + montagem das ofertas pelo layout compilado
+    start = time.perf_counter()
+    count = 0
+    for offset in range(0, len(raw_rows), CHUNK_SIZE):
+        frame = normalize_offers_frame(frame_from_rows(raw_rows[offset:offset + CHUNK_SIZE], header))
+        build_offer = get_builder(tuple(frame.columns), coerce=False)
+        for row in frame.itertuples(index=False, name=None):
+            build_offer(row)
+            count += 1
+    return time.perf_counter() - start, count
+
+
+def phase_serialize(path):
+    rows = iter_normalized_rows(path)
+    build_offer = get_builder(next(rows), coerce=False)
+    offers = [build_offer(row) for row in rows]
+    start = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with OffersJsonWriter(devnull, build_envelope("")) as writer:
+            for offer in offers:
+                writer.write_offer(offer)
+    return time.perf_counter() - start, len(offers)
+
+
+def phase_end_to_end(path):
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        count = generate_json_from_excel(path, os.path.join(directory, "saida.json"))
+        return time.perf_counter() - start, count
+
+
+PHASES = {
+    "read_excel_to_dict": phase_read_pandas,
+    "read_streaming": phase_read_streaming,
+    "convert_columns_to_list": phase_columns_to_list,
+    "transform": phase_transform,
+    "serialize": phase_serialize,
+    "generate_json_from_excel": phase_end_to_end,
+}
+
+
+def _run_phase(name, path):
+    # O pacote só importa pandas e openpyxl na primeira planilha lida; importá-los aqui
+    # deixa o tempo de importação (cerca de 0,3 s) fora do cronômetro de todas as etapas
+    import openpyxl  # noqa: F401
+    import pandas  # noqa: F401
+
+    seconds, count = PHASES[name](path)
+    return seconds, count, peak_rss_mb()
+
+
+# Função para executar uma etapa num processo novo e devolver suas medidas
+def measure(name, path):
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        seconds, count, rss = pool.apply(_run_phase, (name, path))
+    return {
+        "seconds": round(seconds, 4),
+        "offers": count,
+        "offers_per_s": round(count / seconds) if seconds else None,
+        "peak_rss_mb": rss,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das etapas da conversão")
+    parser.add_argument("--rows", type=int, default=20000, help="ofertas na planilha sintética")
+    parser.add_argument("--groups", type=int, default=2,
+                        help="repetições de cada grupo (pagamento, promoção, recarga, pontos)")
+    parser.add_argument("--list-length", type=int, default=5, help="itens em cada coluna de lista")
+    parser.add_argument("--phases", nargs="+", choices=list(PHASES), default=list(PHASES),
+                        help="etapas a medir (padrão: todas)")
+    parser.add_argument("--results", default=DEFAULT_RESULTS,
+                        help="arquivo JSON onde o resultado é acrescentado "
+                             "(padrão: benchmarks/results.json, não versionado)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ofertas.xlsx")
+        write_workbook(path, args.rows, args.groups, args.list_length)
+
+        run = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "schema_version": SCHEMA_VERSION,
+            "params": {"rows": args.rows, "groups": args.groups, "list_length": args.list_length,
+                       "workbook_mb": round(os.path.getsize(path) / 1e6, 2)},
+            "phases": {},
+        }
+        print(f"{args.rows} ofertas, {args.groups} repetições por grupo, listas com "
+              f"{args.list_length} itens ({run['params']['workbook_mb']} MB)")
+        print(f"{'etapa':<26} {'tempo (s)':>10} {'ofertas/s':>12} {'pico RSS (MB)':>14}")
+        for name in args.phases:
+            result = measure(name, path)
+            run["phases"][name] = result
+            print(f"{name:<26} {result['seconds']:>10.3f} {result['offers_per_s'] or 0:>12} "
+                  f"{result['peak_rss_mb'] or '-':>14}")
+
+    history = []
+    if os.path.exists(args.results):
+        with open(args.results, encoding="utf-8") as results_file:
+            history = json.load(results_file)
+    history.append(run)
+    with open(args.results, 'w', encoding='utf-8') as results_file:
+        json.dump(history, results_file, indent=4, ensure_ascii=False)
+    print(f"resultado acrescentado em {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# Benchmark dos serializadores de JSON (biblioteca padrão x orjson, com e sem recuo)
+# Uso (na raiz do repositório): python -m benchmarks.bench_serializers [quantidade_de_ofertas]
+import sys
+import time
+
+from conversao_json.schema import get_builder
+from conversao_json.serializers import orjson, get_serializer
+
+from .synthetic import synthetic_header, synthetic_rows
+
+
+# Função para montar ofertas sintéticas a partir do layout
+def synthetic_offers(count):
+    build_offer = get_builder(synthetic_header())
+    return [build_offer(row) for row in synthetic_rows(count)]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 20000
+    offers = synthetic_offers(count)
+
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+    print(f"{count} ofertas")
+    print(f"{'backend':<8} {'modo':<8} {'tempo (s)':>10} {'ofertas/s':>12} {'MB':>8}")
+    for indent, mode in ((4, "indent=4"), (None, "compacto")):
+        for backend in backends:
+            serializer = get_serializer(indent, False, backend)
+            start = time.perf_counter()
+            size = sum(len(serializer.dumps(offer, depth=2)) for offer in offers)
+            elapsed = time.perf_counter() - start
+            print(f"{backend:<8} {mode:<8} {elapsed:>10.3f} {count / elapsed:>12.0f} {size / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Gerador de planilhas sintéticas no formato da planilha de ofertas da Anatel
+# Uso (na raiz do repositório):
+#   python -m benchmarks.synthetic saida.xlsx --rows 100000 --groups 3 --list-length 20
+import argparse
+import random
+
+from conversao_json.plan import REPEATED_GROUPS
+from conversao_json.reader import OFFERS_SHEET
+from conversao_json.schema import LIST, TEXT, iter_fields
+
+
+# Função para montar o cabeçalho: colunas do layout, CNPJ e `groups` repetições de
+# cada grupo repetido (formaPagamento1, descontoPagamento1, formaPagamento2, ...)
+def synthetic_header(groups=2):
+    columns = ["cnpj"]
+    columns.extend(dict.fromkeys(field.column for field in iter_fields()))
+    for prefixes in REPEATED_GROUPS.values():
+        for number in range(1, groups + 1):
+            columns.extend(f"{prefix}{number}" for prefix in prefixes)
+    return tuple(dict.fromkeys(columns))
+
+
+# Função para gerar as linhas; colunas de lista recebem `list_length` itens
+# A semente fixa faz o mesmo tamanho gerar sempre a mesma planilha
+def synthetic_rows(rows, groups=2, list_length=5, cnpj="12345678000190", seed=0):
+    header = synthetic_header(groups)
+    kinds = {field.column: field.kind for field in iter_fields()}
+    rng = random.Random(seed)
+    for index in range(rows):
+        row = []
+        for position, column in enumerate(header):
+            kind = kinds.get(column)
+            if column == "cnpj":
+                row.append(cnpj)
+            elif column == "identificadorUnico":
+                row.append(f"OF-{index:08d}")
+            elif kind == LIST:
+                row.append(", ".join(f"{column[:4]}{rng.randrange(5570)}" for _ in range(list_length)))
+            elif kind == TEXT or position % 3 == 0:
+                row.append(rng.randrange(1, 100000))
+            elif position % 3 == 1:
+                row.append(round(rng.uniform(0, 500), 2))
+            else:
+                row.append(f"{column} {rng.randrange(1000)}")
+        yield tuple(row)
+
+
+# Função para gravar a planilha sintética (openpyxl em modo write-only)
+def write_workbook(path, rows, groups=2, list_length=5, seed=0):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(OFFERS_SHEET)
+    sheet.append(synthetic_header(groups))
+    for row in synthetic_rows(rows, groups, list_length, seed=seed):
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera uma planilha de ofertas sintética")
+    parser.add_argument("output", help="caminho do .xlsx gerado")
+    parser.add_argument("--rows", type=int, default=10000, help="quantidade de ofertas")
+    parser.add_argument("--groups", type=int, default=2,
+                        help="repetições de cada grupo (pagamento, promoção, recarga, pontos)")
+    parser.add_argument("--list-length", type=int, default=5,
+                        help="itens em cada coluna de lista (ex.: areasAbrangencia)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    write_workbook(args.output, args.rows, args.groups, args.list_length, args.seed)
+    print(f"{args.output}: {args.rows} ofertas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Conversor da planilha regulatória de ofertas (Anatel) para JSON
+# pandas e openpyxl são importados só quando uma planilha é lida, para que
+# importar o pacote (CLI, Streamlit) seja rápido
+from .cache import ConversionCache, get_default_cache
+from .compression import COMPRESSIONS, compress_bytes, compression_for, open_output
+from .converter import (
+    build_envelope,
+    cnpj_json_path,
+    convert_offers,
+    convert_offers_by_cnpj,
+    generate_json_archive,
+    generate_json_bytes,
+    generate_json_from_excel,
+    generate_json_per_cnpj,
+    normalize_cnpj,
+)
+from .engine import (
+    LIST_COLUMNS,
+    STRING_COLUMNS,
+    iter_normalized_rows,
+    iter_offer_frames,
+    normalize_offers_frame,
+)
+from .incremental import generate_json_incremental
+from .instrumentation import PHASES, Profiler
+from .interning import BlockTable, SharedBlock, SharedList
+from .parallel import generate_json_many, generate_json_parallel
+from .plan import REPEATED_GROUPS, convert_columns_to_list
+from .reader import (
+    EXTENSIONS,
+    OFFERS_SHEET,
+    READERS,
+    file_kind,
+    iter_offers,
+    iter_sheet_rows,
+    read_excel_to_dict,
+    select_columns,
+    register_reader,
+)
+from .schema import (
+    OFFER_SCHEMA,
+    SCHEMA_VERSION,
+    Field,
+    Group,
+    compile_builder,
+    get_builder,
+    required_columns,
+    split_list,
+)
+from .serializers import BACKENDS, get_serializer
+from .validation import ValidationReport, compile_validator, get_validator
+from .writer import (
+    OfferEncoder,
+    OffersJsonWriter,
+    SplitOffersWriter,
+    encode_offer,
+    get_offer_encoder,
+    write_offers_json,
+)
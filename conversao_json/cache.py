@@ -0,0 +1,145 @@
+import hashlib
+import io
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from .converter import generate_json_bytes
+from .reader import OFFERS_SHEET
+from .schema import SCHEMA_VERSION
+from .serializers import get_serializer
+
+# Limites padrão do cache em disco
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+MAX_CACHE_AGE = 7 * 24 * 60 * 60
+
+CACHE_SUFFIX = ".json"
+
+
+# Valores de CONVERSAO_JSON_CACHE que desligam o cache em disco
+CACHE_DISABLED = ("0", "off", "false", "no")
+
+
+# Função para o diretório padrão do cache (pode ser trocado por CONVERSAO_JSON_CACHE)
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    directory = os.environ.get("CONVERSAO_JSON_CACHE", "")
+    if directory and directory.lower() not in CACHE_DISABLED:
+        return directory
+    return os.path.join(base, "conversao_json")
+
+
+# Cache de conversões em disco, indexado pelo hash do conteúdo da planilha
+# A chave combina os bytes do arquivo, a versão do layout, a planilha lida, o formato
+# de saída (recuo e serializador) e a data
+# do dia (que vai no campo dataUltimaAtualizacaoArquivo do JSON). A remoção segue
+# LRU: cada acerto atualiza o mtime da entrada e as mais antigas saem primeiro
+# quando o tamanho total ou a idade passam dos limites.
+class ConversionCache:
+    def __init__(self, directory=None, max_bytes=MAX_CACHE_BYTES, max_age=MAX_CACHE_AGE):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, data, sheet_name=OFFERS_SHEET, indent=4, backend="auto"):
+        digest = hashlib.sha256(data)
+        today = datetime.now().strftime("%d/%m/%Y")
+        serializer = get_serializer(indent, False, backend).name
+        digest.update(f"\0{SCHEMA_VERSION}\0{sheet_name}\0{indent}\0{serializer}\0{today}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    # Retorna o JSON guardado para a chave, ou None
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as cached:
+                payload = cached.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return payload
+
+    # Guarda o JSON de forma atômica (arquivo temporário + rename), sem conflito
+    # entre sessões que convertem a mesma planilha ao mesmo tempo
+    def put(self, key, payload):
+        with tempfile.NamedTemporaryFile('wb', dir=self.directory, suffix=".tmp", delete=False) as temp:
+            temp.write(payload)
+        os.replace(temp.name, self._path(key))
+        self.evict()
+
+    # Função principal: devolve o JSON da planilha, convertendo só quando não está no cache
+    def convert(self, data, sheet_name=OFFERS_SHEET, indent=4, backend="auto"):
+        key = self.key(data, sheet_name, indent, backend)
+        payload = self.get(key)
+        if payload is not None:
+            return payload
+
+        # A conversão é feita em memória; o arquivo do cache é só gravado, nunca relido
+        payload = generate_json_bytes(io.BytesIO(data), sheet_name, indent, backend)
+        self.put(key, payload)
+        return payload
+
+    # Remove entradas vencidas e, se o total passar de max_bytes, as menos usadas
+    def evict(self):
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(CACHE_SUFFIX):
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime > self.max_age:
+                self._remove(entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(CACHE_SUFFIX):
+                self._remove(entry.path)
+
+    # Contadores de acertos e falhas e ocupação atual do cache
+    def stats(self):
+        entries = [entry.stat().st_size for entry in os.scandir(self.directory)
+                   if entry.name.endswith(CACHE_SUFFIX)]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(entries),
+        }
+
+
+_default_cache = None
+
+
+# Função para obter o cache padrão do processo (compartilhado entre execuções do Streamlit)
+# Retorna None quando o cache foi desligado com CONVERSAO_JSON_CACHE=off
+def get_default_cache():
+    global _default_cache
+    if os.environ.get("CONVERSAO_JSON_CACHE", "").lower() in CACHE_DISABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = ConversionCache()
+    return _default_cache
@@ -0,0 +1,218 @@
+import argparse
+import glob
+import os
+import sys
+
+from .compression import COMPRESSIONS, compressed_path, compression_for, compression_level
+from .converter import generate_json_archive, generate_json_from_excel, generate_json_per_cnpj
+from .incremental import generate_json_incremental
+from .instrumentation import Profiler
+from .parallel import generate_json_many, generate_json_parallel
+from .reader import EXTENSIONS, OFFERS_SHEET
+from .serializers import BACKENDS
+from .validation import ValidationReport
+
+
+# Função para expandir os argumentos de entrada em arquivos de ofertas
+# Aceita arquivos, padrões glob ("dados/*.xlsx") e diretórios (todos os arquivos de
+# dentro com extensão suportada: .xlsx, .csv, .parquet, ...)
+def expand_inputs(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(path for path in glob.glob(os.path.join(item, "*"))
+                             if os.path.splitext(path)[1].lower() in EXTENSIONS)
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item))
+        else:
+            matches = [item]
+        # Ignora os arquivos temporários que o Excel cria ao abrir uma planilha ("~$...")
+        paths.extend(path for path in matches if not os.path.basename(path).startswith("~$"))
+    return list(dict.fromkeys(paths))
+
+
+# Função para montar o caminho do JSON de saída de cada planilha
+def output_path(excel_path, output_dir):
+    name = os.path.splitext(os.path.basename(excel_path))[0] + ".json"
+    return os.path.join(output_dir, name)
+
+
+# Função para achar saídas repetidas (ex.: a/x.xlsx e b/x.xlsx, ou x.xlsx e x.csv),
+# que fariam uma conversão sobrescrever a outra
+def duplicate_outputs(jobs):
+    seen = {}
+    for excel_path, json_path in jobs:
+        seen.setdefault(os.path.normcase(os.path.abspath(json_path)), []).append(excel_path)
+    return [paths for paths in seen.values() if len(paths) > 1]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="conversao-json",
+        description="Conversor Excel regulatorio para Json",
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="planilhas .xlsx, arquivos .csv/.parquet, padrões glob ou diretórios")
+    parser.add_argument("-d", "--output-dir", default=".",
+                        help="diretório dos JSON gerados (padrão: diretório atual)")
+    parser.add_argument("-o", "--output",
+                        help="caminho do JSON gerado (apenas com uma planilha de entrada)")
+    parser.add_argument("--sheet", default=OFFERS_SHEET,
+                        help=f"planilha com as ofertas, em arquivos Excel (padrão: {OFFERS_SHEET})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos usados na conversão (1 = sem paralelismo)")
+    parser.add_argument("--compact", action="store_true",
+                        help="gera o JSON compacto (sem recuo), para consumo por sistemas")
+    parser.add_argument("--compress", choices=COMPRESSIONS,
+                        help="comprime o JSON enquanto ele é gravado (<saída>.json.gz ou .json.zst; "
+                             "zstd requer o pacote zstandard). Com --output, a extensão .gz/.zst "
+                             "já escolhe a compressão")
+    parser.add_argument("--compress-level", type=int,
+                        help="nível de compressão (padrão: 6 no gzip e no --archive, 3 no zstd)")
+    parser.add_argument("--archive", metavar="ARQUIVO.zip",
+                        help="grava os JSON de todas as entradas dentro de um único .zip, "
+                             "sem arquivos intermediários")
+    parser.add_argument("--json-backend", choices=BACKENDS, default="auto",
+                        help="serializador de JSON (padrão: orjson quando instalado)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reconstrói apenas as ofertas alteradas desde a última execução "
+                             "(estado guardado em <saída>.state; ignora --workers)")
+    parser.add_argument("--split-cnpj", action="store_true",
+                        help="gera um JSON por CNPJ da planilha (<saída>_<cnpj>.json), "
+                             "numa única leitura")
+    parser.add_argument("--validate", action="store_true",
+                        help="confere cada oferta no layout da Anatel e lista os erros "
+                             "(o JSON é gravado mesmo assim; o código de saída passa a ser 1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="mostra, ao final de cada arquivo, o tempo, as linhas, os bytes "
+                             "gravados e o pico de memória de cada etapa da conversão")
+    return parser
+
+
+# Ponto de entrada da linha de comando
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    excel_paths = expand_inputs(args.inputs)
+    if not excel_paths:
+        parser.error("nenhum arquivo de ofertas (.xlsx, .csv, .parquet) encontrado")
+    if args.output and len(excel_paths) > 1:
+        parser.error("--output só pode ser usado com uma planilha de entrada")
+    if args.profile and (args.workers > 1 or args.incremental):
+        parser.error("--profile não pode ser usado com --workers ou --incremental")
+    if args.validate and (args.workers > 1 or args.incremental):
+        parser.error("--validate não pode ser usado com --workers ou --incremental")
+    if args.split_cnpj and (args.workers > 1 or args.incremental):
+        parser.error("--split-cnpj não pode ser usado com --workers ou --incremental")
+
+    compression = args.compress or (compression_for(args.output) if args.output else None)
+    if args.archive:
+        conflicts = [option for option, used in (
+            ("--output", args.output), ("--compress", args.compress), ("--split-cnpj", args.split_cnpj),
+            ("--workers", args.workers > 1), ("--incremental", args.incremental),
+            ("--validate", args.validate), ("--profile", args.profile),
+        ) if used]
+        if conflicts:
+            parser.error(f"--archive não pode ser usado com {', '.join(conflicts)}")
+    elif args.compress_level is not None and compression is None:
+        parser.error("--compress-level só pode ser usado com --compress ou --archive")
+    try:
+        compression_level(compression, args.compress_level)
+    except ValueError as error:
+        parser.error(str(error))
+
+    options = {"indent": None if args.compact else 4, "backend": args.json_backend}
+
+    # Todas as entradas num único .zip, uma entrada <planilha>.json por arquivo
+    if args.archive:
+        jobs = [(path, output_path(path, "")) for path in excel_paths]
+        duplicates = duplicate_outputs(jobs)
+        if duplicates:
+            parser.error("entradas com o mesmo nome no --archive: "
+                         + "; ".join(", ".join(paths) for paths in duplicates))
+        try:
+            counts = generate_json_archive(jobs, args.archive, sheet_name=args.sheet,
+                                           level=args.compress_level, **options)
+        except Exception as error:
+            print(f"{args.archive}: erro na conversão: {error}", file=sys.stderr)
+            return 1
+        for (excel_path, name), count in zip(jobs, counts):
+            print(f"{excel_path} -> {args.archive}:{name} ({count} ofertas)")
+        return 0
+
+    if args.output:
+        jobs = [(excel_paths[0], compressed_path(args.output, compression))]
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        jobs = [(path, compressed_path(output_path(path, args.output_dir), compression))
+                for path in excel_paths]
+        duplicates = duplicate_outputs(jobs)
+        if duplicates:
+            parser.error("entradas que gerariam o mesmo JSON (renomeie ou converta separadamente): "
+                         + "; ".join(", ".join(paths) for paths in duplicates))
+
+    options.update(compression=compression, level=args.compress_level)
+
+    # Vários arquivos com --workers: um arquivo por processo
+    if args.workers > 1 and len(jobs) > 1 and not args.incremental:
+        results = generate_json_many(jobs, workers=args.workers, sheet_name=args.sheet,
+                                     return_exceptions=True, **options)
+        status = 0
+        for (excel_path, json_path), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                print(f"{excel_path}: erro na conversão: {result}", file=sys.stderr)
+                status = 1
+            else:
+                print(f"{excel_path} -> {json_path} ({result} ofertas)")
+        return status
+
+    status = 0
+    for excel_path, json_path in jobs:
+        try:
+            if args.incremental:
+                stats = generate_json_incremental(excel_path, json_path, sheet_name=args.sheet,
+                                                  **options)
+                print(f"{excel_path} -> {json_path} ({stats['offers']} ofertas, "
+                      f"{stats['rebuilt']} reconstruídas)")
+                continue
+            if args.workers > 1:
+                count = generate_json_parallel(excel_path, json_path, workers=args.workers,
+                                               sheet_name=args.sheet, **options)
+            else:
+                profiler = Profiler() if args.profile else None
+                report = ValidationReport() if args.validate else None
+                if profiler is not None:
+                    profiler.start()
+                try:
+                    if args.split_cnpj:
+                        groups = generate_json_per_cnpj(excel_path, json_path, sheet_name=args.sheet,
+                                                        profiler=profiler, report=report, **options)
+                    else:
+                        count = generate_json_from_excel(excel_path, json_path, sheet_name=args.sheet,
+                                                         profiler=profiler, report=report, **options)
+                finally:
+                    if profiler is not None:
+                        profiler.stop()
+                if profiler is not None:
+                    print(profiler.format_summary(), file=sys.stderr)
+                if report is not None:
+                    print(f"{excel_path}: {report.format()}", file=sys.stderr)
+                    if not report.ok:
+                        status = 1
+        except Exception as error:
+            print(f"{excel_path}: erro na conversão: {error}", file=sys.stderr)
+            status = 1
+            continue
+        if args.split_cnpj:
+            if not groups:
+                print(f"{excel_path}: nenhuma oferta encontrada")
+            for cnpj_path, count in groups.values():
+                print(f"{excel_path} -> {cnpj_path} ({count} ofertas)")
+            continue
+        print(f"{excel_path} -> {json_path} ({count} ofertas)")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
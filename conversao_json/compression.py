@@ -0,0 +1,82 @@
+import gzip
+import io
+import os
+
+# Backend zstd opcional (pacote zstandard); o gzip é da biblioteca padrão
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende do ambiente
+    zstandard = None
+
+COMPRESSIONS = ("gzip", "zstd")
+
+# Extensão acrescentada ao nome do JSON comprimido (saida.json -> saida.json.gz)
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# Nível padrão de cada formato: o padrão do zlib (o gzip.open usa 9, bem mais lento
+# para quase nenhum ganho no JSON de ofertas) e o padrão do zstd
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+# Função para conferir o formato de compressão e resolver o nível
+# compression=None (sem compressão) é aceito e devolve nível None
+def compression_level(compression, level=None):
+    if compression is None:
+        return None
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compressão desconhecida: {compression!r} (use {', '.join(COMPRESSIONS)})")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("compressão 'zstd' solicitada, mas o pacote zstandard não está instalado")
+    return DEFAULT_LEVELS[compression] if level is None else level
+
+
+# Função para descobrir a compressão pela extensão do arquivo (.gz, .zst), ou None
+def compression_for(path):
+    extension = os.path.splitext(path)[1].lower()
+    for compression, suffix in SUFFIXES.items():
+        if extension == suffix:
+            return compression
+    return None
+
+
+# Função para acrescentar a extensão da compressão ao caminho (sem repeti-la)
+def compressed_path(path, compression):
+    if compression is None or compression_for(path) == compression:
+        return path
+    return path + SUFFIXES[compression]
+
+
+# Função para separar a extensão da compressão: saida.json.gz -> ("saida.json", ".gz")
+def split_compressed_path(path):
+    if compression_for(path) is None:
+        return path, ""
+    return os.path.splitext(path)
+
+
+# Função para comprimir o que for gravado num arquivo binário já aberto
+# Retorna um arquivo binário de escrita; fechá-lo finaliza o fluxo comprimido sem
+# fechar `fileobj` (ex.: io.BytesIO do download ou uma entrada de .zip)
+def compress_writer(fileobj, compression, level=None):
+    level = compression_level(compression, level)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=level)
+    return zstandard.ZstdCompressor(level=level).stream_writer(fileobj, closefd=False)
+
+
+# Função para abrir o arquivo de saída do JSON, comprimido ou não, em modo texto UTF-8
+# O texto gravado é comprimido à medida que é escrito, sem arquivo intermediário
+def open_output(path, compression=None, level=None):
+    if compression is None:
+        return open(path, 'w', encoding='utf-8')
+    level = compression_level(compression, level)
+    if compression == "gzip":
+        return gzip.open(path, 'wt', compresslevel=level, encoding='utf-8')
+    return zstandard.open(path, 'w', cctx=zstandard.ZstdCompressor(level=level), encoding='utf-8')
+
+
+# Função para comprimir bytes já gerados (ex.: o JSON guardado no cache do Streamlit)
+def compress_bytes(data, compression="gzip", level=None):
+    buffer = io.BytesIO()
+    with compress_writer(buffer, compression, level) as writer:
+        writer.write(data)
+    return buffer.getvalue()
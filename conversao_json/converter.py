@@ -0,0 +1,204 @@
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from datetime import datetime
+from itertools import chain
+
+from .compression import compress_writer, compression_level, split_compressed_path
+from .engine import iter_normalized_rows
+from .reader import DATE_FORMAT, OFFERS_SHEET
+from .schema import get_builder
+from .writer import OffersJsonWriter, SplitOffersWriter, temp_output_path, write_offers_json
+
+
+# Função para montar o envelope do JSON (tudo o que vem antes de "ofertas")
+def build_envelope(cnpj):
+    return {
+        "dataUltimaAtualizacaoArquivo": datetime.now().strftime(DATE_FORMAT),
+        "cnpj": {
+            "cnpj": cnpj,
+        },
+    }
+
+
+# Função para ler e converter as ofertas de uma planilha
+# Retorna o envelope do JSON e um gerador com as ofertas no layout da Anatel;
+# o CNPJ do envelope é extraído da primeira oferta
+# profiler (ver instrumentation) mede leitura, normalização e montagem das ofertas
+def convert_offers(excel_path, sheet_name=OFFERS_SHEET, profiler=None):
+    rows = iter_normalized_rows(excel_path, sheet_name, profiler=profiler)
+    header = next(rows, ())
+    first_row = next(rows, None)
+
+    cnpj = first_row[header.index("cnpj")] if first_row and "cnpj" in header else ""
+    envelope = build_envelope(cnpj)
+
+    # Layout compilado uma única vez para o cabeçalho lido; blocos repetidos entre
+    # ofertas (franquiaVoz, velocidade, SEAC, ...) são montados e codificados uma vez
+    build_offer = get_builder(header, coerce=False, intern=True)
+    if profiler is not None:
+        build_offer = profiler.wrap("build", build_offer)
+
+    rows = chain([first_row], rows) if first_row else rows
+    return envelope, map(build_offer, rows)
+
+
+# Função para ler e converter as ofertas junto com o CNPJ de cada linha
+# Gera pares (cnpj, oferta), na ordem da planilha; sem a coluna cnpj o CNPJ é ""
+def convert_offers_by_cnpj(excel_path, sheet_name=OFFERS_SHEET, profiler=None):
+    rows = iter_normalized_rows(excel_path, sheet_name, profiler=profiler)
+    header = next(rows, ())
+    build_offer = get_builder(header, coerce=False, intern=True)
+    if profiler is not None:
+        build_offer = profiler.wrap("build", build_offer)
+
+    if "cnpj" not in header:
+        for row in rows:
+            yield "", build_offer(row)
+        return
+    position = header.index("cnpj")
+    for row in rows:
+        yield row[position], build_offer(row)
+
+
+# Função para normalizar um CNPJ: só ficam letras e números, então
+# "11.111.111/0001-11", "11111111000111" e "11111111000111 " são o mesmo CNPJ
+def normalize_cnpj(cnpj):
+    return re.sub(r"[^0-9A-Za-z]", "", str(cnpj))
+
+
+# Função para montar o caminho do JSON de um CNPJ: saida.json -> saida_<cnpj>.json
+# (saida.json.gz -> saida_<cnpj>.json.gz), com o CNPJ normalizado (ver normalize_cnpj)
+def cnpj_json_path(json_path, cnpj):
+    json_path, suffix = split_compressed_path(json_path)
+    root, extension = os.path.splitext(json_path)
+    name = normalize_cnpj(cnpj) or "sem_cnpj"
+    return f"{root}_{name}{extension or '.json'}{suffix}"
+
+
+# Função principal para leitura da planilha (Excel, CSV ou Parquet) e escrita do JSON
+# indent=None gera o JSON compacto; backend escolhe o serializador (ver serializers)
+# profiler recebe o tempo, as linhas, os bytes gravados e o pico de memória de cada etapa
+# report (validation.ValidationReport) confere cada oferta no layout à medida que é gerada
+# compression ("gzip" ou "zstd") e level comprimem o JSON enquanto ele é gravado
+def generate_json_from_excel(excel_path, json_path, sheet_name=OFFERS_SHEET, indent=4, backend="auto",
+                             profiler=None, report=None, compression=None, level=None):
+    envelope, offers = convert_offers(excel_path, sheet_name, profiler)
+    if report is not None:
+        report.check_envelope(envelope)
+        offers = report.iterate(offers, profiler)
+    return write_offers_json(json_path, envelope, offers, indent=indent, backend=backend, profiler=profiler,
+                             compression=compression, level=level)
+
+
+# Função para gerar o JSON em memória, sem arquivo intermediário
+# Aceita caminho ou objeto de arquivo (ex.: o upload do Streamlit) e retorna os bytes UTF-8,
+# comprimidos com compression ("gzip" ou "zstd") quando informado
+def generate_json_bytes(excel_file, sheet_name=OFFERS_SHEET, indent=4, backend="auto", report=None,
+                        compression=None, level=None):
+    envelope, offers = convert_offers(excel_file, sheet_name)
+    if report is not None:
+        report.check_envelope(envelope)
+        offers = report.iterate(offers)
+    buffer = io.BytesIO()
+    _write_json_stream(buffer, envelope, offers, indent, backend, compression, level)
+    return buffer.getvalue()
+
+
+# Função para gravar o JSON num arquivo binário já aberto, sem fechá-lo
+def _write_json_stream(fileobj, envelope, offers, indent, backend, compression=None, level=None):
+    binary = fileobj if compression is None else compress_writer(fileobj, compression, level)
+    text = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+    with OffersJsonWriter(text, envelope, indent, backend=backend) as writer:
+        for offer in offers:
+            writer.write_offer(offer)
+    text.flush()
+    text.detach()
+    if binary is not fileobj:
+        binary.close()
+    return writer.count
+
+
+# Função para gerar um JSON por CNPJ (operadoras de um mesmo grupo numa só planilha)
+# A planilha é lida uma única vez; cada oferta vai direto para o arquivo do seu CNPJ
+# (ver writer.SplitOffersWriter), com o envelope do próprio CNPJ. As ofertas são
+# agrupadas pelo CNPJ normalizado (normalize_cnpj): o mesmo CNPJ escrito de formas
+# diferentes vai para um único arquivo, com o CNPJ como escrito na primeira oferta.
+# Os caminhos vêm de cnpj_json_path(json_path, cnpj). Retorna
+# {cnpj: (caminho, quantidade de ofertas)} na ordem em que cada CNPJ aparece;
+# profiler e report funcionam como em generate_json_from_excel
+def generate_json_per_cnpj(excel_path, json_path, sheet_name=OFFERS_SHEET, indent=4, backend="auto",
+                           profiler=None, report=None, compression=None, level=None):
+    names = {}
+
+    def path_for(key):
+        return cnpj_json_path(json_path, key)
+
+    def envelope_for(key):
+        envelope = build_envelope(names[key])
+        if report is not None:
+            report.check_envelope(envelope)
+        return envelope
+
+    offers = convert_offers_by_cnpj(excel_path, sheet_name, profiler)
+    with SplitOffersWriter(path_for, envelope_for, indent, backend=backend, compression=compression,
+                           level=level) as writer:
+        write_offer = writer.write_offer
+        if profiler is not None:
+            write_offer = profiler.wrap("serialize", write_offer)
+        check = None
+        if report is not None:
+            check = report.check if profiler is None else profiler.wrap("validate", report.check)
+        for cnpj, offer in offers:
+            key = normalize_cnpj(cnpj)
+            if key not in names:
+                names[key] = cnpj.strip()
+            if check is not None:
+                check(offer)
+            write_offer(key, offer)
+    if profiler is not None:
+        profiler.record("serialize", 0.0, nbytes=sum(os.path.getsize(path) for path in writer.paths.values()))
+    return {names[key]: (writer.paths[key], count) for key, count in writer.counts.items()}
+
+
+# Entrada do .zip com a data atual e o nível de compressão informado
+# Sem ZipInfo a entrada ficaria com a data de 1980; com ele, o ZipFile não repassa o
+# seu nível (só faz isso para entradas abertas pelo nome)
+def _archive_entry(name, level):
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    if sys.version_info >= (3, 13):
+        info.compress_level = level
+    else:  # pragma: no cover - depende da versão do Python
+        # Antes do 3.13 o nível não é público: é o atributo que o próprio ZipFile
+        # preenche (ZipFile.open e ZipFile.write) e que o 3.13 expõe como compress_level
+        info._compresslevel = level
+    return info
+
+
+# Função para converter vários arquivos direto para dentro de um único .zip
+# `jobs` é uma lista de pares (excel_path, nome do JSON dentro do .zip); cada JSON é
+# gravado na sua entrada à medida que as ofertas são geradas, sem arquivo intermediário
+# no disco. As entradas usam deflate com o nível `level` (padrão do zlib). O .zip é
+# gravado num temporário ao lado do destino (como em writer.atomic_output): se alguma
+# conversão falhar, o .zip anterior continua intacto. Retorna as ofertas gravadas por arquivo
+def generate_json_archive(jobs, archive_path, sheet_name=OFFERS_SHEET, indent=4, backend="auto", level=None):
+    level = compression_level("gzip", level)
+    temp_path = temp_output_path(archive_path)
+    counts = []
+    try:
+        with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=level) as archive:
+            for excel_path, name in jobs:
+                envelope, offers = convert_offers(excel_path, sheet_name)
+                # force_zip64: o tamanho do JSON só é conhecido no fim e pode passar de 2 GB
+                with archive.open(_archive_entry(name, level), 'w', force_zip64=True) as entry:
+                    counts.append(_write_json_stream(entry, envelope, offers, indent, backend))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, archive_path)
+    return counts
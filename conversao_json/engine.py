@@ -0,0 +1,86 @@
+from itertools import islice
+
+from .reader import OFFERS_SHEET, iter_sheet_rows
+from .schema import LIST, TEXT, columns_of_kind, required_columns, split_list
+
+# Colunas que o layout da Anatel exige como texto (mais o CNPJ do envelope)
+STRING_COLUMNS = ("cnpj",) + columns_of_kind(TEXT)
+
+# Colunas com listas separadas por vírgula ("a, b, c" -> ["a", "b", "c"])
+LIST_COLUMNS = columns_of_kind(LIST)
+
+# Quantidade de linhas convertidas por bloco no modo streaming
+CHUNK_SIZE = 10000
+
+
+# Função para separar uma coluna de listas em vírgulas (ver schema.split_list)
+# Células com o mesmo texto recebem a mesma tupla, usada também como chave dos
+# blocos compartilhados do layout; números viram uma lista com um único texto
+def _split_list_column(column):
+    return column.map(split_list)
+
+
+# Função para normalizar o DataFrame de ofertas coluna a coluna
+# NaN vira "", colunas de texto viram str e colunas de lista são separadas
+def normalize_offers_frame(frame):
+    import pandas as pd
+
+    frame = frame.astype(object)
+    frame = frame.where(frame.notna(), "")
+    for column in STRING_COLUMNS:
+        if column in frame:
+            frame[column] = frame[column].astype(str)
+    for column in LIST_COLUMNS:
+        if column in frame:
+            frame[column] = _split_list_column(frame[column])
+        else:
+            frame[column] = pd.Series([()] * len(frame), index=frame.index, dtype=object)
+    return frame
+
+
+# Função para montar o DataFrame de um bloco de linhas lidas da planilha
+# dtype=object preserva os valores como lidos (int continua int)
+def frame_from_rows(rows, header):
+    # pandas só é importado quando há uma planilha para converter
+    import pandas as pd
+
+    return pd.DataFrame(rows, columns=header, dtype=object)
+
+
+# Função para ler a planilha de ofertas em blocos de DataFrame, sem carregar tudo
+# Por padrão só as colunas usadas pelo layout são lidas (columns=None lê todas)
+# profiler (ver instrumentation) mede a leitura das linhas como etapa "read"
+def iter_offer_frames(file_path, sheet_name=OFFERS_SHEET, chunksize=CHUNK_SIZE, profiler=None,
+                      columns=required_columns):
+    rows = iter_sheet_rows(file_path, sheet_name, columns)
+    if profiler is None:
+        header = next(rows, None)
+    else:
+        # Abrir a planilha acontece ao ler o cabeçalho e também conta como leitura
+        with profiler.phase("read"):
+            header = next(rows, None)
+        rows = profiler.iterate("read", rows)
+    if header is None:
+        return
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if not chunk:
+            return
+        yield frame_from_rows(chunk, header)
+
+
+# Função para ler as linhas já normalizadas, bloco a bloco
+# Assim como iter_sheet_rows, a primeira tupla gerada é o cabeçalho
+def iter_normalized_rows(file_path, sheet_name=OFFERS_SHEET, chunksize=CHUNK_SIZE, profiler=None,
+                         columns=required_columns):
+    header = None
+    for frame in iter_offer_frames(file_path, sheet_name, chunksize, profiler, columns):
+        if profiler is None:
+            frame = normalize_offers_frame(frame)
+        else:
+            with profiler.phase("normalize", len(frame)):
+                frame = normalize_offers_frame(frame)
+        if header is None:
+            header = tuple(frame.columns)
+            yield header
+        yield from frame.itertuples(index=False, name=None)
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import sqlite3
+from itertools import chain
+
+from .converter import build_envelope
+from .reader import OFFERS_SHEET, iter_sheet_rows
+from .schema import SCHEMA_VERSION, get_builder, required_columns
+from .serializers import get_serializer
+from .writer import OffersJsonWriter, atomic_output
+
+STATE_SUFFIX = ".state"
+
+
+# Função para calcular a impressão digital das células de origem de uma linha
+def row_fingerprint(row):
+    return hashlib.blake2b(repr(row).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Função para identificar o que invalida o estado inteiro: cabeçalho, layout e formatação
+def _state_signature(header, indent, ensure_ascii, backend):
+    return json.dumps([SCHEMA_VERSION, list(header), indent, ensure_ascii, backend])
+
+
+# Função para abrir o estado da execução anterior (None se não existir ou não servir)
+def _load_state(state_path, signature):
+    if not os.path.exists(state_path):
+        return None
+    connection = sqlite3.connect(state_path)
+    try:
+        row = connection.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+    except sqlite3.DatabaseError:
+        row = None
+    if row is None or row[0] != signature:
+        connection.close()
+        return None
+    return connection
+
+
+def _create_state(state_path, signature):
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    connection = sqlite3.connect(state_path)
+    connection.executescript("""
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE offers (id TEXT PRIMARY KEY, fingerprint TEXT, fragment TEXT);
+    """)
+    connection.execute("INSERT INTO meta VALUES ('signature', ?)", (signature,))
+    return connection
+
+
+# Função para gerar o JSON reaproveitando as ofertas que não mudaram desde a última execução
+# Cada linha é identificada por identificadorUnico; se as células de origem forem as
+# mesmas, o trecho JSON guardado é copiado para a saída sem reconstruir a oferta.
+# O estado fica em um arquivo sqlite (por padrão, <json_path>.state).
+# A planilha ainda é lida inteira (é preciso comparar as linhas); o ganho está em
+# não montar nem codificar as ofertas inalteradas.
+# Só as colunas usadas pelo layout entram na comparação: mudanças em colunas
+# internas da operadora não reconstroem a oferta.
+def generate_json_incremental(excel_path, json_path, state_path=None, sheet_name=OFFERS_SHEET,
+                              indent=4, ensure_ascii=False, backend="auto", compression=None, level=None):
+    state_path = state_path or json_path + STATE_SUFFIX
+    rows = iter_sheet_rows(excel_path, sheet_name, required_columns)
+    header = next(rows, ())
+    first_row = next(rows, None)
+
+    cnpj = str(first_row[header.index("cnpj")]) if first_row and "cnpj" in header else ""
+    envelope = build_envelope(cnpj)
+    build_offer = get_builder(header)
+    id_index = header.index("identificadorUnico") if "identificadorUnico" in header else None
+
+    serializer = get_serializer(indent, ensure_ascii, backend)
+    signature = _state_signature(header, indent, ensure_ascii, serializer.name)
+    previous = _load_state(state_path, signature)
+    new_state_path = state_path + ".new"
+    current = _create_state(new_state_path, signature)
+
+    stats = {"offers": 0, "rebuilt": 0, "reused": 0}
+    rows = chain([first_row], rows) if first_row else rows
+    try:
+        with atomic_output(json_path, compression, level) as json_file:
+            with OffersJsonWriter(json_file, envelope, indent, ensure_ascii, backend) as writer:
+                for row in rows:
+                    offer_id = str(row[id_index]) if id_index is not None else ""
+                    fingerprint = row_fingerprint(row)
+                    fragment = None
+                    if offer_id and previous is not None:
+                        cached = previous.execute(
+                            "SELECT fingerprint, fragment FROM offers WHERE id = ?", (offer_id,)
+                        ).fetchone()
+                        if cached is not None and cached[0] == fingerprint:
+                            fragment = cached[1]
+
+                    if fragment is None:
+                        fragment = serializer.dumps(build_offer(row), depth=2)
+                        stats["rebuilt"] += 1
+                    else:
+                        stats["reused"] += 1
+
+                    if offer_id:
+                        current.execute("INSERT OR REPLACE INTO offers VALUES (?, ?, ?)",
+                                        (offer_id, fingerprint, fragment))
+                    writer.write_encoded(fragment)
+                stats["offers"] = writer.count
+        current.commit()
+    except BaseException:
+        current.close()
+        os.remove(new_state_path)
+        raise
+    finally:
+        if previous is not None:
+            previous.close()
+
+    current.close()
+    os.replace(new_state_path, state_path)
+    return stats
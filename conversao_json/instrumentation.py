@@ -0,0 +1,125 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Etapas medidas na conversão, na ordem em que aparecem no resumo
+PHASES = ("read", "normalize", "build", "validate", "serialize")
+
+
+# Medidor das etapas da conversão (tempo, linhas, bytes gravados e pico de memória)
+# As etapas são medidas de forma exclusiva: como a conversão é em streaming, o tempo
+# de cada etapa é a soma dos trechos em que ela executou. Cada medição passa por
+# record(), que também chama o callback (se houver) com
+# callback(etapa, segundos, linhas, bytes, pico_de_memoria).
+# O pico é o da memória rastreada pelo tracemalloc durante a etapa, incluindo o que
+# já estava alocado antes dela; trace_memory=False mede só os tempos, que ficam
+# mais próximos dos de uma execução sem profiler.
+# Sem profiler (profiler=None) a conversão segue o caminho normal, sem custo extra.
+class Profiler:
+    def __init__(self, callback=None, trace_memory=True):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.stats = {}
+        self.wall_seconds = 0.0
+        self._start = None
+        self._owns_tracing = False
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self._start is not None:
+            self.wall_seconds += time.perf_counter() - self._start
+            self._start = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _tracing(self):
+        return self.trace_memory and tracemalloc.is_tracing()
+
+    def _reset_peak(self):
+        # tracemalloc.reset_peak existe a partir do Python 3.9
+        if self._tracing() and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def _peak(self):
+        return tracemalloc.get_traced_memory()[1] if self._tracing() else None
+
+    def record(self, name, seconds, rows=0, nbytes=0, peak=None):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = {"seconds": 0.0, "rows": 0, "bytes": 0, "peak_bytes": None}
+        stats["seconds"] += seconds
+        stats["rows"] += rows
+        stats["bytes"] += nbytes
+        if peak is not None and (stats["peak_bytes"] is None or peak > stats["peak_bytes"]):
+            stats["peak_bytes"] = peak
+        if self.callback is not None:
+            self.callback(name, seconds, rows, nbytes, peak)
+
+    # Mede um trecho de código: with profiler.phase("normalize", rows=len(frame)): ...
+    @contextmanager
+    def phase(self, name, rows=0):
+        self._reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, rows, peak=self._peak())
+
+    # Mede o tempo de obter cada item de um iterável (ex.: linhas lidas da planilha)
+    def iterate(self, name, iterable):
+        iterator = iter(iterable)
+        while True:
+            self._reset_peak()
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.record(name, time.perf_counter() - start, peak=self._peak())
+                return
+            self.record(name, time.perf_counter() - start, 1, peak=self._peak())
+            yield item
+
+    # Mede cada chamada de uma função (ex.: build_offer), contando uma linha por chamada
+    def wrap(self, name, function):
+        def measured(*args, **kwargs):
+            self._reset_peak()
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start, 1, peak=self._peak())
+        return measured
+
+    # Resumo por etapa, na ordem de PHASES (etapas extras ao final)
+    def summary(self):
+        names = [name for name in PHASES if name in self.stats]
+        names += [name for name in self.stats if name not in PHASES]
+        return {name: dict(self.stats[name]) for name in names}
+
+    def format_summary(self):
+        wall = self.wall_seconds or sum(stats["seconds"] for stats in self.stats.values())
+        lines = [f"{'etapa':<10} {'tempo (s)':>10} {'%':>6} {'linhas':>10} {'linhas/s':>10} "
+                 f"{'MB gravados':>12} {'pico (MB)':>10}"]
+        for name, stats in self.summary().items():
+            seconds = stats["seconds"]
+            share = 100 * seconds / wall if wall else 0
+            rate = f"{stats['rows'] / seconds:.0f}" if seconds and stats["rows"] else "-"
+            written = f"{stats['bytes'] / 1e6:.2f}" if stats["bytes"] else "-"
+            peak = f"{stats['peak_bytes'] / 1e6:.1f}" if stats["peak_bytes"] is not None else "-"
+            lines.append(f"{name:<10} {seconds:>10.3f} {share:>6.1f} {stats['rows']:>10} {rate:>10} "
+                         f"{written:>12} {peak:>10}")
+        lines.append(f"{'total':<10} {wall:>10.3f}")
+        return "\n".join(lines)
@@ -0,0 +1,47 @@
+# Limite de blocos guardados por tipo de bloco; ao atingi-lo a tabela recomeça vazia
+MAX_SHARED_BLOCKS = 2048
+
+
+# Bloco do layout compartilhado entre as ofertas com as mesmas células de origem
+# (custoInicial, franquiaVoz, velocidade, dependentes, SEAC, ...)
+# Para quem usa a oferta é um dict comum, que deve ser tratado como somente leitura.
+# O texto JSON do bloco, depois de codificado, fica guardado em `fragments`
+# (por serializador e profundidade) e é reaproveitado pelo writer; o resultado da
+# validação fica em `errors` (ver validation)
+class SharedBlock(dict):
+    __slots__ = ("fragments", "errors")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fragments = {}
+        self.errors = None
+
+
+# Tabela com os blocos de um tipo, indexados pela tupla das células de origem
+# Usada pelo código gerado em schema.compile_builder(..., intern=True)
+class BlockTable(dict):
+    def __init__(self, max_entries=MAX_SHARED_BLOCKS):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def store(self, key, block):
+        if len(self) >= self.max_entries:
+            self.clear()
+        block = self[key] = SharedBlock(block)
+        return block
+
+
+# Lista grande compartilhada (ex.: areasAbrangencia com milhares de municípios)
+# É uma tupla (imutável) que, como o SharedBlock, guarda o próprio texto JSON em
+# `fragments` para ser codificada uma única vez e o resultado da validação em
+# `errors`. Ver schema.split_list
+class SharedList(tuple):
+    def __new__(cls, items=()):
+        self = super().__new__(cls, items)
+        self.fragments = {}
+        self.errors = None
+        return self
+
+
+# Tipos cujo texto JSON é guardado e reaproveitado pelo writer
+SHARED_TYPES = (SharedBlock, SharedList)
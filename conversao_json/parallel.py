@@ -0,0 +1,84 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+
+from .converter import build_envelope, generate_json_from_excel
+from .engine import CHUNK_SIZE, frame_from_rows, normalize_offers_frame
+from .reader import OFFERS_SHEET, iter_sheet_rows
+from .schema import get_builder, required_columns
+from .writer import OffersJsonWriter, atomic_output, encode_offer
+
+
+# Função executada nos processos: converte um bloco de linhas em ofertas já codificadas
+# Devolver texto em vez de dicionários deixa a volta para o processo principal barata
+def _convert_chunk(header, chunk, indent, ensure_ascii, backend):
+    frame = normalize_offers_frame(frame_from_rows(chunk, header))
+    build_offer = get_builder(tuple(frame.columns), coerce=False, intern=True)
+    return [
+        encode_offer(build_offer(row), indent, ensure_ascii, backend)
+        for row in frame.itertuples(index=False, name=None)
+    ]
+
+
+# Função para distribuir tarefas no pool e devolver os resultados na ordem de envio
+# No máximo `window` tarefas ficam pendentes, então a leitura não se adianta demais
+def _ordered_results(executor, fn, tasks, window):
+    pending = deque()
+    for args in tasks:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# Função para gerar o JSON de uma planilha dividindo as linhas entre processos
+# O processo principal lê a planilha e grava o arquivo; os processos constroem as ofertas.
+# A saída é idêntica à de generate_json_from_excel
+def generate_json_parallel(excel_path, json_path, workers=None, sheet_name=OFFERS_SHEET,
+                           chunksize=CHUNK_SIZE, indent=4, ensure_ascii=False, backend="auto",
+                           compression=None, level=None):
+    rows = iter_sheet_rows(excel_path, sheet_name, required_columns)
+    header = next(rows, ())
+    chunks = iter(lambda: list(islice(rows, chunksize)), [])
+    first_chunk = next(chunks, [])
+
+    cnpj = str(first_chunk[0][header.index("cnpj")]) if first_chunk and "cnpj" in header else ""
+    envelope = build_envelope(cnpj)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        window = 2 * workers
+        tasks = ((header, chunk, indent, ensure_ascii, backend) for chunk in chain([first_chunk], chunks) if chunk)
+        with atomic_output(json_path, compression, level) as json_file:
+            with OffersJsonWriter(json_file, envelope, indent, ensure_ascii, backend) as writer:
+                for encoded_offers in _ordered_results(executor, _convert_chunk, tasks, window):
+                    for encoded in encoded_offers:
+                        writer.write_encoded(encoded)
+                return writer.count
+
+
+# Função para converter vários arquivos em paralelo, um arquivo por processo
+# `jobs` é uma lista de pares (excel_path, json_path); retorna as ofertas gravadas por
+# arquivo. Com return_exceptions=True uma falha não interrompe o lote: o erro do
+# arquivo entra na lista no lugar da quantidade de ofertas (como em asyncio.gather)
+def generate_json_many(jobs, workers=None, sheet_name=OFFERS_SHEET, indent=4, backend="auto",
+                       compression=None, level=None, return_exceptions=False):
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    convert = partial(generate_json_from_excel, sheet_name=sheet_name, indent=indent, backend=backend,
+                      compression=compression, level=level)
+    results = []
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(convert, excel_path, json_path) for excel_path, json_path in jobs]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                results.append(error)
+    return results
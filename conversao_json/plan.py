@@ -0,0 +1,82 @@
+import re
+from functools import lru_cache
+
+# Grupos de colunas repetidas: campo do JSON -> prefixos das colunas que o compõem
+REPEATED_GROUPS = {
+    "formasPagamento": ("formaPagamento", "descontoPagamento"),
+    "listaPromocoes": ("descricaoPromocao", "tempoDesconto", "descontoPromocao"),
+    "modalidadesRecarga": ("valorRecarga", "validadeRecarga", "beneficioRecarga"),
+    "pontos": ("tipo", "numeroPontos", "pontoAdicional"),
+}
+
+# Sufixo aceito depois do prefixo: número da repetição ("formaPagamento10") e/ou
+# o sufixo de coluna duplicada gerado na leitura ("tempoDesconto.1")
+_SUFFIX = re.compile(r"(\d*)(?:\.(\d+))?")
+
+
+# Função para ordenar uma coluna do grupo pelo sufixo numérico
+# Retorna None quando a coluna só compartilha o início do nome ("tipoOferta" x "tipo")
+def _suffix_order(prefix, column):
+    if not column.startswith(prefix):
+        return None
+    match = _SUFFIX.fullmatch(column, len(prefix))
+    if match is None:
+        return None
+    number, duplicate = match.groups()
+    return (int(number or 0), int(duplicate or 0))
+
+
+# Função para resolver, uma única vez por cabeçalho, as colunas de um grupo
+# Retorna uma tupla por repetição com as colunas de cada prefixo, na ordem do sufixo.
+# Um prefixo pode ter mais colunas do que o grupo tem repetições quando o nome também
+# é usado fora do grupo: no modelo da Anatel "tempoDesconto" é da fidelização e o
+# "tempoDesconto" das promoções é lido como "tempoDesconto.1". Nesse caso cada
+# repetição fica com a coluna mais próxima das demais colunas da mesma repetição
+@lru_cache(maxsize=256)
+def resolve_group(columns, prefixes):
+    position = {column: index for index, column in enumerate(columns)}
+    candidates = []
+    for prefix in prefixes:
+        keyed = [(_suffix_order(prefix, column), column) for column in columns]
+        candidates.append([column for key, column in sorted(k for k in keyed if k[0] is not None)])
+    repetitions = min((len(found) for found in candidates), default=0)
+
+    # Colunas sem ambiguidade (prefixos com exatamente uma coluna por repetição)
+    anchors = [[] for _ in range(repetitions)]
+    for found in candidates:
+        if len(found) == repetitions:
+            for number, column in enumerate(found):
+                anchors[number].append(position[column])
+
+    ordered = []
+    for found in candidates:
+        if len(found) == repetitions or not all(anchors):
+            ordered.append(found[:repetitions])
+            continue
+        chosen = []
+        available = list(found)
+        for number in range(repetitions):
+            column = min(available, key=lambda candidate: sum(abs(position[candidate] - anchor)
+                                                               for anchor in anchors[number]))
+            available.remove(column)
+            chosen.append(column)
+        ordered.append(chosen)
+    return tuple(zip(*ordered))
+
+
+# Função para montar a lista de dicionários de um grupo já resolvido
+# Só entram as repetições com todas as colunas preenchidas
+def expand_group(offer, prefixes, column_sets):
+    items = []
+    for col_set in column_sets:
+        values = [offer[col] for col in col_set]
+        if all(values):
+            items.append(dict(zip(prefixes, values)))
+    return items
+
+
+# Função para converter colunas em uma lista de dicionários
+# As colunas de cada prefixo são resolvidas uma vez por cabeçalho
+def convert_columns_to_list(offer, prefixes):
+    prefixes = tuple(prefixes)
+    return expand_group(offer, prefixes, resolve_group(tuple(offer), prefixes))
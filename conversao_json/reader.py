@@ -0,0 +1,291 @@
+import csv
+import io
+import os
+import re
+from datetime import date, time, timedelta
+
+# Nome da planilha com as ofertas
+OFFERS_SHEET = "offers"
+
+# Linhas lidas por vez de um arquivo Parquet
+PARQUET_BATCH_SIZE = 10000
+
+# Formato das datas no layout da Anatel (o mesmo de dataUltimaAtualizacaoArquivo)
+DATE_FORMAT = "%d/%m/%Y"
+
+# Formato das células de hora (sem data) da planilha
+TIME_FORMAT = "%H:%M:%S"
+
+
+# Função para ler cada planilha e convertê-la num dictionary
+# CSV e Parquet têm uma única tabela, devolvida com o nome da planilha de ofertas
+# columns projeta a leitura (ver select_columns), ex.: columns=required_columns
+def read_excel_to_dict(file_path, columns=None):
+    import pandas as pd
+
+    kind = file_kind(file_path)
+    if kind == "csv":
+        options = {"sep": None, "engine": "python", "encoding": "utf-8-sig"}
+        if columns is not None:
+            header = pd.read_csv(file_path, nrows=0, **options).columns
+            options["usecols"] = _positions(header, columns)
+            if hasattr(file_path, "seek"):
+                file_path.seek(0)
+        frame = pd.read_csv(file_path, **options)
+        return {OFFERS_SHEET: frame.to_dict(orient='records')}
+    if kind == "parquet":
+        parquet = _open_parquet(file_path)
+        names = select_columns(parquet.schema_arrow.names, columns)
+        frame = parquet.read(columns=list(names)).to_pandas()
+        return {OFFERS_SHEET: frame.to_dict(orient='records')}
+
+    excel_data = pd.ExcelFile(file_path)
+    data = {}
+    for sheet_name in excel_data.sheet_names:
+        usecols = None
+        if columns is not None:
+            usecols = _positions(excel_data.parse(sheet_name, nrows=0).columns, columns)
+        data[sheet_name] = excel_data.parse(sheet_name, usecols=usecols).to_dict(orient='records')
+    return data
+
+
+# Função para aplicar uma projeção de colunas a um cabeçalho
+# columns pode ser None (todas as colunas), uma função que recebe o cabeçalho e
+# retorna as colunas desejadas (ex.: schema.required_columns) ou uma coleção de nomes.
+# O resultado mantém a ordem do cabeçalho
+def select_columns(header, columns):
+    header = tuple(header)
+    if columns is None:
+        return header
+    wanted = set(columns(header) if callable(columns) else columns)
+    return tuple(column for column in header if column in wanted)
+
+
+def _positions(header, columns):
+    selected = set(select_columns(header, columns))
+    return [position for position, column in enumerate(header) if column in selected]
+
+
+# Função para renomear colunas repetidas do cabeçalho como o pandas faz
+# ("tempoDesconto", "tempoDesconto.1", ...) e nomear colunas sem título
+def _dedupe_header(header):
+    names = []
+    seen = {}
+    for index, name in enumerate(header):
+        name = f"Unnamed: {index}" if name is None or name == "" else str(name)
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        if count:
+            name = f"{name}.{count}"
+            # Garante que o nome gerado também não colida com outra coluna
+            while name in seen:
+                count += 1
+                name = f"{name.rsplit('.', 1)[0]}.{count}"
+            seen[name] = 1
+        names.append(name)
+    return names
+
+
+# Função comum a todos os leitores: gera o cabeçalho e depois as linhas de dados,
+# com células vazias convertidas em "" (mesmo padrão de offer.get(..., "")),
+# linhas totalmente vazias ignoradas e todas as linhas com a largura do cabeçalho
+# Com columns, só as colunas projetadas são geradas; uma linha continua sendo
+# ignorada apenas se estiver vazia por inteiro, como sem projeção.
+# convert é aplicado às células mantidas (ex.: números de um CSV)
+def _table_rows(header, rows, columns=None, convert=None):
+    header = tuple(_dedupe_header(header))
+    width = len(header)
+    selected = select_columns(header, columns)
+    positions = None
+    if selected != header:
+        index = {column: position for position, column in enumerate(header)}
+        positions = [index[column] for column in selected]
+    yield selected
+
+    for row in rows:
+        # Ignora linhas totalmente vazias (formatação sem conteúdo)
+        if all(value is None or value == "" for value in row):
+            continue
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        row = row[:width] if positions is None else [row[position] for position in positions]
+        if convert is None:
+            yield tuple("" if value is None else value for value in row)
+        else:
+            yield tuple("" if value is None else convert(value) for value in row)
+
+
+# Células de data e hora (openpyxl ou Parquet, ex.: dataInicioOferta) viram texto:
+# datas no dd/mm/aaaa do layout, horas como hh:mm:ss e durações (formato [h]:mm do
+# Excel, lidas como timedelta) como o total de horas, ex.: 36:30:00. Sem isso cada
+# serializador trataria esses valores de um jeito (o orjson gravaria ISO 8601 e a
+# biblioteca padrão daria erro)
+def _date_value(value):
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    if isinstance(value, time):
+        return value.strftime(TIME_FORMAT)
+    if isinstance(value, timedelta):
+        return _duration_text(value)
+    return value
+
+
+def _duration_text(value):
+    seconds = round(value.total_seconds())
+    sign = "-" if seconds < 0 else ""
+    minutes, seconds = divmod(abs(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{sign}{hours}:{minutes:02d}:{seconds:02d}"
+
+
+# Leitor de planilhas Excel, em modo read-only
+# O openpyxl ainda percorre todas as células; a projeção evita converter e
+# carregar adiante as colunas que não serão usadas
+def iter_xlsx_rows(file_path, sheet_name=OFFERS_SHEET, columns=None):
+    # openpyxl só é importado quando há uma planilha para ler
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        yield from _table_rows(header, rows, columns, convert=_date_value)
+    finally:
+        workbook.close()
+
+
+# Números "simples" de um CSV viram int/float, como as células numéricas do Excel;
+# textos com zero à esquerda ("007") ou vírgula decimal ("99,90") continuam texto
+_CSV_INT = re.compile(r"-?(?:0|[1-9]\d*)")
+_CSV_FLOAT = re.compile(r"-?(?:0|[1-9]\d*)\.\d+")
+
+
+def _csv_value(text):
+    if not text:
+        return text
+    if _CSV_INT.fullmatch(text):
+        return int(text)
+    if _CSV_FLOAT.fullmatch(text):
+        return float(text)
+    return text
+
+
+# Leitor de CSV (UTF-8, com ou sem BOM); o separador (",", ";", tab ou "|") é
+# detectado pelo início do arquivo. sheet_name é ignorado: o CSV é uma única tabela
+def iter_csv_rows(file_path, sheet_name=OFFERS_SHEET, columns=None):
+    owned = isinstance(file_path, (str, os.PathLike))
+    if owned:
+        text = open(file_path, encoding="utf-8-sig", newline="")
+    else:
+        text = io.TextIOWrapper(file_path, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(64 * 1024)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+        rows = csv.reader(text, dialect)
+        header = next(rows, None)
+        if header is None:
+            return
+        yield from _table_rows(header, rows, columns, convert=_csv_value)
+    finally:
+        if owned:
+            text.close()
+        else:
+            # Não fecha o arquivo recebido (ex.: o upload do Streamlit)
+            text.detach()
+
+
+def _open_parquet(file_path):
+    # pyarrow só é necessário para entradas Parquet (extra "parquet")
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(file_path)
+
+
+# Leitor de Parquet, em lotes; com columns, só as colunas projetadas são lidas do
+# arquivo (formato colunar). sheet_name é ignorado
+def iter_parquet_rows(file_path, sheet_name=OFFERS_SHEET, columns=None):
+    parquet = _open_parquet(file_path)
+    header = select_columns(parquet.schema_arrow.names, columns)
+    batches = parquet.iter_batches(batch_size=PARQUET_BATCH_SIZE, columns=list(header))
+
+    def rows():
+        for batch in batches:
+            columns = [column.to_pylist() for column in batch.columns]
+            for row in zip(*columns):
+                # NaN (float ausente gravado pelo pandas) conta como célula vazia
+                yield tuple(None if value != value else value for value in row)
+
+    yield from _table_rows(header, rows(), convert=_date_value)
+
+
+# Leitores por tipo de arquivo; cada um gera o cabeçalho e depois as linhas
+# Outros formatos podem ser acrescentados com register_reader
+READERS = {
+    "xlsx": iter_xlsx_rows,
+    "csv": iter_csv_rows,
+    "parquet": iter_parquet_rows,
+}
+
+# Tipo de arquivo por extensão
+EXTENSIONS = {
+    ".xlsx": "xlsx",
+    ".xlsm": "xlsx",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+
+# Função para registrar (ou substituir) o leitor de um tipo de arquivo
+def register_reader(kind, reader, extensions=()):
+    READERS[kind] = reader
+    for extension in extensions:
+        EXTENSIONS[extension.lower()] = kind
+
+
+# Função para identificar o tipo de um arquivo de entrada (caminho ou objeto de arquivo)
+# Usa a extensão do nome; objetos sem nome reconhecido (ex.: bytes em memória) são
+# identificados pelos primeiros bytes: xlsx é um zip ("PK"), Parquet começa com "PAR1"
+# e o restante é tratado como CSV
+def file_kind(file):
+    is_path = isinstance(file, (str, os.PathLike))
+    name = os.fspath(file) if is_path else getattr(file, "name", None)
+    if isinstance(name, str):
+        kind = EXTENSIONS.get(os.path.splitext(name)[1].lower())
+        if kind is not None:
+            return kind
+    if is_path:
+        raise ValueError(f"formato de arquivo não suportado: {name!r} "
+                         f"(use {', '.join(EXTENSIONS)})")
+    position = file.tell()
+    signature = file.read(4)
+    file.seek(position)
+    if signature[:2] == b"PK":
+        return "xlsx"
+    if signature == b"PAR1":
+        return "parquet"
+    return "csv"
+
+
+# Função para ler a tabela de ofertas linha a linha, com o leitor do tipo do arquivo
+# A primeira tupla gerada é o cabeçalho; as seguintes são as linhas de dados
+# sheet_name só se aplica a planilhas Excel; columns projeta as colunas lidas
+# (ver select_columns), ex.: columns=schema.required_columns
+def iter_sheet_rows(file_path, sheet_name=OFFERS_SHEET, columns=None):
+    return READERS[file_kind(file_path)](file_path, sheet_name, columns)
+
+
+# Função para ler as ofertas uma a uma, sem carregar a planilha inteira
+def iter_offers(file_path, sheet_name=OFFERS_SHEET):
+    rows = iter_sheet_rows(file_path, sheet_name)
+    header = next(rows, None)
+    if header is None:
+        return
+    for row in rows:
+        yield dict(zip(header, row))
@@ -0,0 +1,395 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from .interning import BlockTable, SharedList
+from .plan import REPEATED_GROUPS, resolve_group
+
+# Tipos de campo do layout
+RAW = "raw"      # valor da célula como lido
+TEXT = "text"    # valor convertido em texto (str)
+LIST = "list"    # texto separado em vírgulas ("a, b" -> ["a", "b"])
+
+# Campo simples: coluna de origem na planilha e tipo de conversão
+# fallback é a coluna lida quando a de origem não existe no cabeçalho
+Field = namedtuple("Field", ["column", "kind", "fallback"], defaults=[RAW, None])
+
+# Campo com lista de dicionários montada a partir de um grupo de colunas repetidas
+Group = namedtuple("Group", ["name"])
+
+
+# Quantidade de textos distintos memorizados por split_list
+SPLIT_CACHE_SIZE = 4096
+
+# A partir deste tamanho (em caracteres) o texto é tratado como lista grande:
+# memorizado à parte, num cache menor, e devolvido como SharedList, cujo JSON é
+# codificado uma única vez (ex.: areasAbrangencia com milhares de municípios)
+HUGE_LIST_CHARS = 1024
+HUGE_LIST_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=SPLIT_CACHE_SIZE)
+def _split_text(value):
+    return tuple([item.strip() for item in value.split(",")]) if value else ()
+
+
+@lru_cache(maxsize=HUGE_LIST_CACHE_SIZE)
+def _split_huge_text(value):
+    return SharedList([item.strip() for item in value.split(",")])
+
+
+# Função para separar um texto em vírgulas ("a, b" -> ("a", "b"); "" -> ()). O
+# resultado é uma tupla memorizada pelo texto de origem: células iguais recebem o
+# mesmo objeto, que não deve ser alterado. Listas já prontas (ex.: colunas
+# list<string> do Parquet) viram tuplas, para servirem de chave dos blocos
+# compartilhados. Qualquer outro valor é um único item em texto: um código de
+# município guardado como número (3550308, ou 3550308.0) vira ("3550308",)
+def split_list(value):
+    if isinstance(value, str):
+        if len(value) >= HUGE_LIST_CHARS:
+            return _split_huge_text(value)
+        return _split_text(value)
+    if isinstance(value, tuple):
+        return value
+    if isinstance(value, list):
+        return tuple(value)
+    if value is None:
+        return ()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return _split_text(str(value))
+
+
+# Versão do layout: deve ser incrementada a cada mudança no JSON gerado
+# (invalida, por exemplo, o cache de conversões)
+SCHEMA_VERSION = 5
+
+
+# Layout da Anatel, definido uma única vez
+# Objetos referenciados em mais de um lugar (franquiaVoz) são montados uma vez por oferta
+FRANQUIA_VOZ = {
+    "localFixoOnNet": Field("localFixoOnNet"),
+    "localFixoOffNet": Field("localFixoOffNet"),
+    "localMovelOnNet": Field("localMovelOnNet"),
+    "localMovelOffNet": Field("localMovelOffNet"),
+    "fixoLdnOnNet": Field("fixoLdnOnNet"),
+    "fixoLdnOffNet": Field("fixoLdnOffNet"),
+    "movelLdnOnNet": Field("movelLdnOnNet"),
+    "movelLdnOffNet": Field("movelLdnOffNet"),
+    "ldi": Field("ldi"),
+}
+
+OFFER_SCHEMA = {
+    "identificadorUnico": Field("identificadorUnico"),
+    "tipoOferta": Field("tipoOferta"),
+    "nomeOferta": Field("nomeOferta"),
+    "codigoOferta": Field("codigoOferta", TEXT),
+    "custoInicial": {
+        "adesao": Field("adesao", TEXT),
+        "instalacao": Field("instalacao", TEXT),
+        "equipamento": Field("equipamento", TEXT),
+    },
+    "etiquetaOferta": Field("etiquetaOferta"),
+    "linkSite": Field("linkSite"),
+    "dataInicioOferta": Field("dataInicioOferta"),
+    "dataFimOferta": Field("dataFimOferta"),
+    "fidelizacao": {
+        "tempoFidelizacao": Field("tempoFidelizacao"),
+        "descontoFidelizacao": Field("descontoFidelizacao"),
+        "tempoDesconto": Field("tempoDesconto"),
+        "beneficioFidelizacao": Field("beneficioFidelizacao"),
+        "multaFidelizacao": Field("multaFidelizacao", TEXT),
+    },
+    "formasPagamento": Group("formasPagamento"),
+    "destaqueOferta": Field("destaqueOferta"),
+    "areasAbrangencia": Field("areasAbrangencia", LIST),
+    "notasExtras": Field("notasExtras"),
+    "focoVenda": Field("focoVenda"),
+    "regOferta": Field("regOferta"),
+    "modoEquipamento": Field("modoEquipamento"),
+    "precoSemDescontos": Field("precoSemDescontos"),
+    "listaPromocoes": Group("listaPromocoes"),
+    "beneficiosOfertaConjunta": Field("beneficiosOfertaConjunta"),
+    "STFC": {
+        "listaPUC": Field("listaPUC", LIST),
+        "franquiaVoz": FRANQUIA_VOZ,
+        "condicoesAposConsumoFranquia": Field("condicoesAposConsumoFranquia"),
+    },
+    "SMP": {
+        "modalidadePagamento": Field("modalidadePagamento"),
+        "validadePacote": Field("validadePacote"),
+        "franquiaDados": {
+            "unidadeFranquia": Field("unidadeFranquia"),
+            "franquia": Field("franquia"),
+            "listaAppsFranquiaEspecial": Field("listaAppsFranquiaEspecial", LIST),
+            "unidadeFranquiaEspecial": Field("unidadeFranquiaEspecial"),
+            "franquiaEspecial": Field("franquiaEspecial"),
+        },
+        "listaAppIsentos": Field("SMP_listaAppIsentos", LIST),
+        "listaSVA": Field("SMP_listaSVA", LIST),
+        "cobrancaTipo": {
+            "tipoCobranca": Field("tipoCobranca"),
+            "detalhesCobranca": Field("detalhesCobranca"),
+        },
+        "franquiaVoz": FRANQUIA_VOZ,
+        "franquiaSMS": {
+            "onNet": Field("onNet"),
+            "offNet": Field("offNet"),
+        },
+        # O modelo da Anatel repete o cabeçalho no bloco do SMP, lido como ".1";
+        # planilhas sem a repetição usam a coluna única
+        "condicoesAposConsumoFranquia": Field(
+            "condicoesAposConsumoFranquia.1", fallback="condicoesAposConsumoFranquia"),
+        "condicoesAposValidadePacote": Field("condicoesAposValidadePacote"),
+        "modalidadesRecarga": Group("modalidadesRecarga"),
+        "roamingNacional": Field("roamingNacional"),
+        "roamingInternacional": Field("roamingInternacional"),
+        "dependentes": {
+            "quantidade": Field("quantidade"),
+            "valor": Field("valor"),
+            "compartilhamento": Field("compartilhamento"),
+        },
+    },
+    "SCM": {
+        "wifiIncluso": Field("wifiIncluso"),
+        "listaTecnologia": Field("SCM_listaTecnologia", LIST),
+        "velocidade": {
+            "download": Field("download"),
+            "unidadeDownload": Field("unidadeDownload"),
+            "downloadMinGarantida": Field("downloadMinGarantida"),
+            "unidadeDownloadMinGarantida": Field("unidadeDownloadMinGarantida"),
+            "upload": Field("upload"),
+            "unidadeUpload": Field("unidadeUpload"),
+        },
+        "listaSVA": Field("SCM_listaSVA", LIST),
+    },
+    "SEAC": {
+        "listaTecnologia": Field("SEAC_listaTecnologia", LIST),
+        "multiPlataforma": Field("multiPlataforma"),
+        "dvr": Field("dvr"),
+        "pontos": Group("pontos"),
+        "listaCanais": Field("SEAC_listaCanais", LIST),
+        "listaCanaisAvulsos": Field("SEAC_listaCanaisAvulsos", LIST),
+        "listaSVA": Field("SEAC_listaSVA", LIST),
+    },
+}
+
+
+# Função para percorrer todos os campos simples do layout
+def iter_fields(schema=OFFER_SCHEMA):
+    for value in schema.values():
+        if isinstance(value, dict):
+            yield from iter_fields(value)
+        elif isinstance(value, Field):
+            yield value
+
+
+# Função para listar as colunas que um campo pode ler (a de origem e a alternativa)
+def field_columns(field):
+    return (field.column,) if field.fallback is None else (field.column, field.fallback)
+
+
+# Função para listar as colunas de um tipo de campo (ex.: todas as colunas LIST)
+def columns_of_kind(kind, schema=OFFER_SCHEMA):
+    return tuple(dict.fromkeys(
+        column for field in iter_fields(schema) if field.kind == kind for column in field_columns(field)
+    ))
+
+
+# Função para selecionar, de um cabeçalho, as colunas que o layout usa: campos
+# simples, as colunas de cada repetição dos grupos e o cnpj do envelope
+# Mantém a ordem do cabeçalho; as demais colunas não afetam o JSON gerado
+def required_columns(columns, schema=OFFER_SCHEMA, groups=REPEATED_GROUPS):
+    columns = tuple(columns)
+    used = {"cnpj"}
+    used.update(column for field in iter_fields(schema) for column in field_columns(field))
+    for prefixes in groups.values():
+        for column_set in resolve_group(columns, prefixes):
+            used.update(column_set)
+    return tuple(column for column in columns if column in used)
+
+
+# Função para montar o expansor de um grupo repetido a partir dos índices das colunas
+# Só entram as repetições com todas as colunas preenchidas
+def _group_expander(prefixes, index_sets):
+    def expand(row):
+        items = []
+        for indices in index_sets:
+            values = [row[i] for i in indices]
+            if all(values):
+                items.append(dict(zip(prefixes, values)))
+        return items
+    return expand
+
+
+# Compilador do layout: gera o código Python de uma função build_offer(row)
+# especializada para o cabeçalho lido, em que cada campo vira um acesso direto
+# row[i] dentro de um único literal de dicionário
+# Com intern, cada bloco aninhado (custoInicial, STFC, franquiaVoz, ...) é montado uma
+# vez por combinação de células de origem e reaproveitado (ver interning.SharedBlock)
+class _BuilderSource:
+    def __init__(self, columns, coerce, groups, intern=False):
+        self.index = {}
+        for position, column in enumerate(columns):
+            self.index.setdefault(column, position)
+        self.columns = tuple(columns)
+        self.coerce = coerce
+        self.groups = groups
+        self.intern = intern
+        self.namespace = {"_text": str, "_split": split_list, "_type": type}
+        self.shared = {}
+        self.lines = []
+
+    # Posição da célula de um campo: a coluna de origem ou, na falta dela, a alternativa
+    def field_position(self, field):
+        position = self.index.get(field.column)
+        if position is None and field.fallback is not None:
+            position = self.index.get(field.fallback)
+        return position
+
+    def field(self, field):
+        position = self.field_position(field)
+        if position is None:
+            return "()" if field.kind == LIST else '""'
+        value = f"row[{position}]"
+        if not self.coerce or field.kind == RAW:
+            return value
+        return f"_text({value})" if field.kind == TEXT else f"_split({value})"
+
+    def group_indices(self, group):
+        return tuple(
+            tuple(self.index[column] for column in column_set)
+            for column_set in resolve_group(self.columns, self.groups[group.name])
+        )
+
+    def group(self, group):
+        name = f"_group_{group.name}"
+        if name not in self.namespace:
+            prefixes = self.groups[group.name]
+            self.namespace[name] = _group_expander(prefixes, self.group_indices(group))
+        return f"{name}(row)"
+
+    def value(self, value, depth):
+        if isinstance(value, Field):
+            return self.field(value)
+        if isinstance(value, Group):
+            return self.group(value)
+        if self.intern:
+            return self.interned_object(value)
+        return self.shared_object(value) if self._is_shared(value) else self.object(value, depth)
+
+    # Posições das células de origem de um bloco (incluindo blocos e grupos internos)
+    def positions(self, schema):
+        found = set()
+        for value in schema.values():
+            if isinstance(value, Field):
+                position = self.field_position(value)
+                if position is not None:
+                    found.add(position)
+            elif isinstance(value, Group):
+                found.update(position for indices in self.group_indices(value) for position in indices)
+            else:
+                found.update(self.positions(value))
+        return found
+
+    # Bloco reaproveitado: procurado pelas suas células e montado só se for novo
+    # A chave leva o tipo de cada célula junto do valor, porque 1, 1.0 e True são
+    # iguais como chave de dicionário mas geram JSON diferente. Células que não podem
+    # ser chave (ex.: listas dentro de um campo simples) montam o bloco sem guardá-lo
+    def interned_object(self, schema):
+        key = id(schema)
+        if key not in self.shared:
+            number = len(self.shared)
+            name = f"block_{number}"
+            self.shared[key] = name
+            literal = self.object(schema, 3)
+            cells = [f"_type(row[{position}]), row[{position}]" for position in sorted(self.positions(schema))]
+            self.namespace[f"_blocks_{number}"] = BlockTable()
+            self.lines += [
+                f"    key_{number} = ({', '.join(cells)},)" if cells else f"    key_{number} = ()",
+                f"    try:",
+                f"        {name} = _blocks_{number}.get(key_{number})",
+                f"        if {name} is None:",
+                f"            {name} = _blocks_{number}.store(key_{number}, {literal})",
+                f"    except TypeError:",
+                f"        {name} = {literal}",
+            ]
+        return self.shared[key]
+
+    def object(self, schema, depth):
+        pad = "    " * (depth + 1)
+        items = [f"{pad}{key!r}: {self.value(value, depth + 1)}," for key, value in schema.items()]
+        return "{\n" + "\n".join(items) + "\n" + "    " * depth + "}"
+
+    # Objetos usados em mais de um ponto do layout viram variáveis locais
+    def shared_object(self, schema):
+        key = id(schema)
+        if key not in self.shared:
+            name = f"shared_{len(self.shared)}"
+            self.shared[key] = name
+            self.lines.append(f"    {name} = {self.object(schema, 1)}")
+        return self.shared[key]
+
+    def _is_shared(self, schema):
+        return id(schema) in self.shared_ids
+
+    def compile(self, schema):
+        counts = {}
+        self._count_objects(schema, counts)
+        self.shared_ids = {key for key, count in counts.items() if count > 1}
+        body = self.object(schema, 1)
+        lines = ["def build_offer(row):", *self.lines, f"    return {body}"]
+        return "\n".join(lines) + "\n"
+
+    def _count_objects(self, schema, counts):
+        for value in schema.values():
+            if isinstance(value, dict):
+                counts[id(value)] = counts.get(id(value), 0) + 1
+                self._count_objects(value, counts)
+
+
+# Função para gerar o código do build_offer(row) de um cabeçalho
+# Retorna o código compilado, o texto do código e os nomes usados por ele
+def _builder_code(columns, coerce=True, schema=OFFER_SCHEMA, groups=REPEATED_GROUPS, intern=False):
+    source = _BuilderSource(columns, coerce, groups, intern)
+    code = source.compile(schema)
+    return compile(code, "<conversao_json.schema>", "exec"), code, source.namespace
+
+
+# Função para criar o build_offer a partir do código gerado
+# Cada build_offer recebe tabelas de blocos (interning.BlockTable) novas e vazias
+def _new_builder(compiled, code, namespace):
+    namespace = {name: BlockTable() if isinstance(value, BlockTable) else value
+                 for name, value in namespace.items()}
+    exec(compiled, namespace)
+    build_offer = namespace["build_offer"]
+    build_offer.source = code
+    return build_offer
+
+
+# Função para compilar o layout numa função build_offer(row) para um cabeçalho
+# coerce=False quando as linhas já vêm normalizadas (ver engine.normalize_offers_frame)
+# intern=True reaproveita os blocos repetidos entre as ofertas de um mesmo build_offer
+def compile_builder(columns, coerce=True, schema=OFFER_SCHEMA, groups=REPEATED_GROUPS, intern=False):
+    return _new_builder(*_builder_code(columns, coerce, schema, groups, intern))
+
+
+@lru_cache(maxsize=32)
+def _cached_builder_code(columns, coerce, intern):
+    return _builder_code(columns, coerce, intern=intern)
+
+
+@lru_cache(maxsize=32)
+def _plain_builder(columns, coerce):
+    return _new_builder(*_cached_builder_code(columns, coerce, False))
+
+
+# Função para obter o build_offer de um cabeçalho, compilando só na primeira vez
+# Em lotes de arquivos com o mesmo cabeçalho o layout é compilado uma única vez.
+# Com intern=True cada chamada devolve um build_offer com tabelas de blocos próprias:
+# deve ser chamada uma vez por conversão, para que blocos não passem de um arquivo
+# (ou de uma sessão do Streamlit/serviço) para outro
+def get_builder(columns, coerce=True, intern=False):
+    columns = tuple(columns)
+    if not intern:
+        return _plain_builder(columns, coerce)
+    return _new_builder(*_cached_builder_code(columns, coerce, True))
@@ -0,0 +1,98 @@
+import json
+import re
+from functools import lru_cache
+
+# Backend nativo opcional: usado automaticamente quando instalado
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+BACKENDS = ("auto", "orjson", "json")
+
+# Quebra de linha seguida do recuo gerado pelo orjson (sempre de 2 espaços)
+_NEWLINE_INDENT = re.compile(r"\n *")
+
+
+# Serializador da biblioteca padrão
+# indent=None gera a saída compacta, sem espaços entre os separadores
+class StdlibSerializer:
+    name = "json"
+
+    def __init__(self, indent=4, ensure_ascii=False):
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self._separators = (",", ":") if indent is None else (",", ": ")
+
+    def dumps(self, value, depth=0):
+        encoded = json.dumps(value, indent=self.indent, ensure_ascii=self.ensure_ascii,
+                             separators=self._separators)
+        if self.indent and depth:
+            encoded = encoded.replace("\n", "\n" + " " * (depth * self.indent))
+        return encoded
+
+
+# Tabela com o texto que substitui cada "\n" + recuo de 2 espaços do orjson,
+# indexada pelo tamanho do trecho encontrado e preenchida sob demanda
+class _IndentTable(dict):
+    def __init__(self, unit, pad):
+        super().__init__()
+        self.unit = unit
+        self.pad = pad
+
+    def __missing__(self, width):
+        value = "\n" + self.pad + self.unit * ((width - 1) // 2)
+        self[width] = value
+        return value
+
+
+# O orjson não serializa subclasses de tuple (interning.SharedList) por conta própria
+# Datas chegam aqui (OPT_PASSTHROUGH_DATETIME) e dão erro, como na biblioteca padrão
+def _orjson_default(value):
+    if isinstance(value, tuple):
+        return tuple(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Serializador com orjson (extensão nativa, bem mais rápida que a biblioteca padrão)
+# O orjson só indenta com 2 espaços; o recuo é convertido para `indent` numa única
+# passada, já somado ao recuo de aninhamento (depth). Textos, inteiros e a estrutura
+# saem iguais aos da biblioteca padrão; floats muito grandes ou muito pequenos podem
+# ser escritos de outra forma, com o mesmo valor (1e16 x 1e+16, 0.00005 x 5e-05,
+# 1e-7 x 1e-07), então a saída dos dois backends não é idêntica byte a byte.
+class OrjsonSerializer:
+    name = "orjson"
+    ensure_ascii = False
+
+    def __init__(self, indent=4):
+        self.indent = indent
+        self._option = orjson.OPT_PASSTHROUGH_DATETIME
+        if indent is not None:
+            self._option |= orjson.OPT_INDENT_2
+        self._tables = {}
+
+    def dumps(self, value, depth=0):
+        encoded = orjson.dumps(value, default=_orjson_default, option=self._option).decode("utf-8")
+        if self.indent is None or (self.indent == 2 and not depth):
+            return encoded
+        table = self._tables.get(depth)
+        if table is None:
+            table = self._tables[depth] = _IndentTable(" " * self.indent, " " * (depth * self.indent))
+        return _NEWLINE_INDENT.sub(lambda match: table[match.end() - match.start()], encoded)
+
+
+# Função para escolher o serializador
+# "auto" usa o orjson quando instalado (e sem ensure_ascii, que ele não suporta)
+@lru_cache(maxsize=16)
+def get_serializer(indent=4, ensure_ascii=False, backend="auto"):
+    if backend not in BACKENDS:
+        raise ValueError(f"backend de JSON desconhecido: {backend!r} (use {', '.join(BACKENDS)})")
+    if backend == "orjson":
+        if orjson is None:
+            raise ValueError("backend 'orjson' solicitado, mas o pacote orjson não está instalado")
+        if ensure_ascii:
+            raise ValueError("o backend 'orjson' não suporta ensure_ascii")
+        return OrjsonSerializer(indent)
+    if backend == "auto" and orjson is not None and not ensure_ascii:
+        return OrjsonSerializer(indent)
+    return StdlibSerializer(indent, ensure_ascii)
@@ -0,0 +1,354 @@
+# Serviço HTTP local de conversão, para uso por outros sistemas
+# Só biblioteca padrão: asyncio para as conexões e um pool de processos para as
+# conversões, que nunca bloqueiam o laço de eventos. Rotas:
+#   POST   /jobs?sheet=offers&compact=1&filename=x.xlsx   corpo = arquivo (xlsx, csv, parquet)
+#   GET    /jobs/<id>                                     situação do job
+#   GET    /jobs/<id>/result?wait=1                       JSON gerado, enviado em streaming
+#   DELETE /jobs/<id>                                     remove o job e seus arquivos
+#   GET    /status                                        fila, jobs em execução e limites
+# Com a fila cheia o envio é recusado com 503 e Retry-After (contrapressão).
+# Uso: python -m conversao_json.service --port 8000 --workers 2 --max-queue 8
+#      curl --data-binary @planilha.xlsx "http://127.0.0.1:8000/jobs?filename=planilha.xlsx"
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from .converter import generate_json_from_excel
+from .reader import EXTENSIONS, OFFERS_SHEET, file_kind
+
+# Tamanho máximo do arquivo enviado
+MAX_UPLOAD_BYTES = 256 * 1024 * 1024
+
+# Tempo (s) que um job concluído fica disponível antes de ser descartado
+RESULT_TTL = 3600
+
+# Tamanho dos blocos lidos do upload e enviados na resposta
+STREAM_CHUNK = 256 * 1024
+
+# Extensão usada para gravar cada tipo de entrada (a primeira de cada tipo em EXTENSIONS)
+_KIND_EXTENSIONS = {kind: extension for extension, kind in reversed(list(EXTENSIONS.items()))}
+
+_REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+# Erro que vira uma resposta HTTP com a mensagem em JSON
+class HttpError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+# Job de conversão: arquivo recebido, JSON gerado e situação
+# (queued -> running -> done | failed)
+class Job:
+    def __init__(self, directory, input_path, sheet_name, indent):
+        self.id = os.path.basename(directory)
+        self.directory = directory
+        self.input_path = input_path
+        self.json_path = os.path.join(directory, "ofertas.json")
+        self.sheet_name = sheet_name
+        self.indent = indent
+        self.status = "queued"
+        self.offers = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.done = asyncio.Event()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "offers": self.offers,
+            "error": self.error,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+# Serviço de conversão: fila limitada de jobs consumida por `workers` tarefas, cada
+# uma executando generate_json_from_excel num processo do pool
+class ConversionService:
+    def __init__(self, workers=2, max_queue=8, directory=None, max_upload_bytes=MAX_UPLOAD_BYTES,
+                 result_ttl=RESULT_TTL, backend="auto"):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.directory = directory or tempfile.mkdtemp(prefix="conversao_json_jobs_")
+        self.max_upload_bytes = max_upload_bytes
+        self.result_ttl = result_ttl
+        self.backend = backend
+        self.jobs = {}
+        self.running = 0
+        self._queue = None
+        self._executor = None
+        self._tasks = []
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._queue = asyncio.Queue(self.max_queue)
+        # spawn: um processo criado por fork herdaria os sockets abertos no momento
+        # (a conexão do primeiro POST nunca chegaria ao fim para o cliente)
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if sys.version_info >= (3, 9):
+            self._executor.shutdown(cancel_futures=True)
+        else:  # pragma: no cover - Python 3.8 não tem cancel_futures
+            self._executor.shutdown()
+
+    def status(self):
+        return {
+            "queue": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "workers": self.workers,
+            "jobs": len(self.jobs),
+        }
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            self.running += 1
+            try:
+                job.offers = await loop.run_in_executor(
+                    self._executor, generate_json_from_excel, job.input_path, job.json_path,
+                    job.sheet_name, job.indent, self.backend)
+                job.status = "done"
+            except Exception as error:
+                job.status = "failed"
+                job.error = str(error)
+            finally:
+                self.running -= 1
+                job.finished = time.time()
+                job.done.set()
+                self._queue.task_done()
+
+    # Remove os jobs concluídos há mais de result_ttl segundos
+    def _expire(self):
+        limit = time.time() - self.result_ttl
+        for job in list(self.jobs.values()):
+            if job.finished is not None and job.finished < limit:
+                self.remove(job.id)
+
+    def remove(self, job_id):
+        job = self.jobs.pop(job_id)
+        shutil.rmtree(job.directory, ignore_errors=True)
+
+    def get(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise HttpError(404, f"job não encontrado: {job_id}")
+        return job
+
+    # Recebe o arquivo enviado e coloca o job na fila
+    # A fila é verificada antes de ler o corpo, para não receber uploads que seriam recusados
+    async def submit(self, reader, length, params):
+        self._expire()
+        if self._queue.full():
+            raise HttpError(503, "fila de conversão cheia, tente novamente mais tarde",
+                            {"Retry-After": "5"})
+        if length > self.max_upload_bytes:
+            raise HttpError(413, f"arquivo maior que o limite de {self.max_upload_bytes} bytes")
+
+        directory = os.path.join(self.directory, uuid.uuid4().hex)
+        os.makedirs(directory)
+        upload_path = os.path.join(directory, "upload")
+        try:
+            with open(upload_path, "wb") as upload:
+                remaining = length
+                while remaining:
+                    chunk = await reader.read(min(STREAM_CHUNK, remaining))
+                    if not chunk:
+                        raise HttpError(400, "upload incompleto")
+                    upload.write(chunk)
+                    remaining -= len(chunk)
+            input_path = upload_path + self._extension(upload_path, params.get("filename"))
+            os.replace(upload_path, input_path)
+
+            indent = None if params.get("compact") in ("1", "true") else 4
+            job = Job(directory, input_path, params.get("sheet", OFFERS_SHEET), indent)
+            # A fila pode ter enchido enquanto o upload era recebido
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise HttpError(503, "fila de conversão cheia, tente novamente mais tarde",
+                            {"Retry-After": "5"})
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        self.jobs[job.id] = job
+        return job
+
+    # Extensão do arquivo salvo: a do nome informado ou, sem ele, a detectada pelo conteúdo
+    @staticmethod
+    def _extension(path, filename):
+        if filename:
+            extension = os.path.splitext(filename)[1].lower()
+            if extension not in EXTENSIONS:
+                raise HttpError(400, f"formato de arquivo não suportado: {filename!r}")
+            return extension
+        with open(path, "rb") as upload:
+            return _KIND_EXTENSIONS[file_kind(io.BytesIO(upload.read(4)))]
+
+    # Atende uma conexão: uma requisição por conexão
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, target, headers = await _read_request(reader)
+                await self._route(method, target, headers, reader, writer)
+            except HttpError as error:
+                await _send_json(writer, error.status, {"error": str(error)}, error.headers)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except Exception as error:
+                await _send_json(writer, 500, {"error": str(error)})
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(self, method, target, headers, reader, writer):
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["status"] and method == "GET":
+            return await _send_json(writer, 200, self.status())
+        if parts == ["jobs"] and method == "POST":
+            if "content-length" not in headers:
+                raise HttpError(411, "envie o arquivo com Content-Length")
+            length = headers["content-length"].strip()
+            if not (length.isascii() and length.isdigit()):
+                raise HttpError(400, "Content-Length inválido")
+            job = await self.submit(reader, int(length), params)
+            body = dict(job.to_dict(), queue=self._queue.qsize())
+            return await _send_json(writer, 202, body, {"Location": f"/jobs/{job.id}"})
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.get(parts[1])
+            if method == "GET":
+                return await _send_json(writer, 200, job.to_dict())
+            if method == "DELETE":
+                if job.status in ("queued", "running"):
+                    raise HttpError(409, "o job ainda não terminou")
+                self.remove(job.id)
+                return await _send_json(writer, 200, {"id": job.id, "status": "deleted"})
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result" and method == "GET":
+            job = self.get(parts[1])
+            if params.get("wait") in ("1", "true"):
+                await job.done.wait()
+            if job.status == "failed":
+                raise HttpError(500, f"a conversão falhou: {job.error}")
+            if job.status != "done":
+                raise HttpError(409, f"o job ainda não terminou (status: {job.status})")
+            return await _send_file(writer, job.json_path)
+        raise HttpError(404 if method in ("GET", "POST", "DELETE") else 405, "rota não encontrada")
+
+
+# Função para ler a linha de requisição e os cabeçalhos HTTP
+async def _read_request(reader):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HttpError(400, "cabeçalhos muito grandes")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "requisição inválida")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", ""):
+        raise HttpError(411, "envie o arquivo com Content-Length")
+    return method.upper(), target, headers
+
+
+def _response_head(status, headers):
+    lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _send_json(writer, status, payload, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = {"Content-Type": "application/json; charset=utf-8", "Content-Length": str(len(body))}
+    head.update(headers or {})
+    writer.write(_response_head(status, head) + body)
+    await writer.drain()
+
+
+# Função para enviar o JSON gerado em blocos, sem carregá-lo inteiro em memória
+async def _send_file(writer, path):
+    head = {"Content-Type": "application/json; charset=utf-8",
+            "Content-Length": str(os.path.getsize(path)),
+            "Content-Disposition": 'attachment; filename="Json_anatel.json"'}
+    writer.write(_response_head(200, head))
+    with open(path, "rb") as result:
+        while True:
+            chunk = result.read(STREAM_CHUNK)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+
+
+# Função para executar o serviço até ser interrompido
+async def serve(host="127.0.0.1", port=8000, **options):
+    service = ConversionService(**options)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="conversao-json-service",
+                                     description="Serviço HTTP local de conversão para JSON")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço de escuta (padrão: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="porta (padrão: 8000)")
+    parser.add_argument("--workers", type=int, default=2, help="conversões simultâneas (processos)")
+    parser.add_argument("--max-queue", type=int, default=8,
+                        help="jobs aguardando na fila; além disso o envio recebe 503")
+    parser.add_argument("--directory", help="diretório dos arquivos dos jobs (padrão: temporário)")
+    args = parser.parse_args(argv)
+
+    print(f"Serviço de conversão em http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers, max_queue=args.max_queue,
+                          directory=args.directory))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
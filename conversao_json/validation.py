@@ -0,0 +1,229 @@
+from functools import lru_cache
+
+from .interning import SharedBlock, SharedList
+from .plan import REPEATED_GROUPS
+from .schema import LIST, RAW, TEXT, OFFER_SCHEMA, Field, Group
+
+# Tipos aceitos em campos simples (valores de célula)
+_SCALARS = frozenset((str, int, float, bool))
+
+# Tipos aceitos em campos de lista
+_LISTS = frozenset((list, tuple, SharedList))
+
+_MISSING = object()
+
+
+def _describe(value):
+    return "nenhum valor (campo ausente)" if value is _MISSING else type(value).__name__
+
+
+def _type_error(expected, value):
+    return f"esperado {expected}, recebido {_describe(value)}"
+
+
+def _keys_error(value, expected):
+    extra = sorted(repr(key) for key in value.keys() - expected)
+    missing = sorted(repr(key) for key in expected - value.keys())
+    parts = []
+    if extra:
+        parts.append(f"chaves inesperadas: {', '.join(extra)}")
+    if missing:
+        parts.append(f"chaves ausentes: {', '.join(missing)}")
+    return "; ".join(parts)
+
+
+# Função para conferir uma lista de textos (colunas LIST)
+# Listas grandes compartilhadas (SharedList) são conferidas uma única vez
+def _list_error(value):
+    if type(value) not in _LISTS:
+        return _type_error("lista de textos", value)
+    if type(value) is SharedList:
+        if value.errors is None:
+            value.errors = _list_items_error(value) or ""
+        return value.errors or None
+    return _list_items_error(value)
+
+
+def _list_items_error(value):
+    for item in value:
+        if type(item) is not str:
+            return f"esperado lista de textos, com item {type(item).__name__}"
+    return None
+
+
+# Função para conferir a lista de dicionários de um grupo repetido
+def _group_error(value, keys):
+    if type(value) not in _LISTS:
+        return _type_error("lista de objetos", value)
+    for item in value:
+        if not isinstance(item, dict):
+            return f"esperado lista de objetos, com item {type(item).__name__}"
+        if item.keys() != keys:
+            return _keys_error(item, keys)
+        for field in item.values():
+            if type(field) not in _SCALARS:
+                return f"valor {type(field).__name__} em item da lista"
+    return None
+
+
+# Função para conferir um bloco; blocos compartilhados (SharedBlock) guardam o resultado
+def _cached(value, check):
+    if type(value) is SharedBlock:
+        if value.errors is None:
+            value.errors = tuple(check(value))
+        return value.errors
+    return check(value)
+
+
+def _nest(name, errors):
+    return [(f"{name}.{path}" if path else name, message) for path, message in errors]
+
+
+# Compilador do validador: gera uma função de conferência por objeto do layout, com
+# as chaves e os tipos esperados de cada campo, como em schema.compile_builder
+# Cada função retorna a lista de (caminho, mensagem) dos problemas encontrados
+class _ValidatorSource:
+    def __init__(self, groups):
+        self.groups = groups
+        self.namespace = {
+            "_SCALARS": _SCALARS, "_MISSING": _MISSING, "_type_error": _type_error,
+            "_keys_error": _keys_error, "_list_error": _list_error, "_group_error": _group_error,
+            "_cached": _cached, "_nest": _nest,
+        }
+        self.functions = {}
+        self.sources = []
+
+    def field(self, key, field):
+        if field.kind == RAW:
+            return [f"    if type(item) not in _SCALARS:",
+                    f"        errors.append(({key!r}, _type_error('valor simples', item)))"]
+        if field.kind == TEXT:
+            return [f"    if type(item) is not str:",
+                    f"        errors.append(({key!r}, _type_error('texto', item)))"]
+        if field.kind == LIST:
+            return [f"    message = _list_error(item)",
+                    f"    if message:",
+                    f"        errors.append(({key!r}, message))"]
+        raise ValueError(f"tipo de campo desconhecido: {field.kind!r}")
+
+    def group(self, key, group):
+        name = f"_group_keys_{group.name}"
+        self.namespace[name] = frozenset(self.groups[group.name])
+        return [f"    message = _group_error(item, {name})",
+                f"    if message:",
+                f"        errors.append(({key!r}, message))"]
+
+    def object(self, schema):
+        if id(schema) in self.functions:
+            return self.functions[id(schema)]
+        name = f"_check_{len(self.functions)}"
+        self.functions[id(schema)] = name
+        self.namespace[f"{name}_keys"] = frozenset(schema)
+
+        lines = [f"def {name}(value):",
+                 f"    if not isinstance(value, dict):",
+                 f"        return [('', _type_error('objeto', value))]",
+                 f"    errors = []",
+                 f"    if value.keys() != {name}_keys:",
+                 f"        errors.append(('', _keys_error(value, {name}_keys)))"]
+        for key, value in schema.items():
+            lines.append(f"    item = value.get({key!r}, _MISSING)")
+            if isinstance(value, Field):
+                lines += self.field(key, value)
+            elif isinstance(value, Group):
+                lines += self.group(key, value)
+            else:
+                child = self.object(value)
+                lines += [f"    found = _cached(item, {child})",
+                          f"    if found:",
+                          f"        errors.extend(_nest({key!r}, found))"]
+        lines.append("    return errors")
+        self.sources.append("\n".join(lines) + "\n")
+        return name
+
+
+# Função para compilar o layout num validador validate_offer(offer)
+# Retorna a lista de (caminho, mensagem), vazia quando a oferta está no layout:
+# todas as chaves (sem sobras nem faltas), textos, listas de textos e grupos
+def compile_validator(schema=OFFER_SCHEMA, groups=REPEATED_GROUPS):
+    source = _ValidatorSource(groups)
+    entry = source.object(schema)
+    code = "\n\n".join(source.sources)
+    namespace = source.namespace
+    exec(compile(code, "<conversao_json.validation>", "exec"), namespace)
+    validate_offer = namespace[entry]
+    validate_offer.source = code
+    return validate_offer
+
+
+# Função para obter o validador do layout da Anatel, compilado uma única vez
+@lru_cache(maxsize=1)
+def get_validator():
+    return compile_validator()
+
+
+# Relatório de validação de uma conversão
+# Confere cada oferta à medida que ela é gerada (iterate), sem guardar as ofertas.
+# Guarda até max_details erros com o número da oferta (a partir de 1) e o
+# identificadorUnico; as contagens consideram todos os erros
+class ValidationReport:
+    def __init__(self, max_details=1000, validator=None):
+        self.validate_offer = validator or get_validator()
+        self.max_details = max_details
+        self.offers = 0
+        self.invalid_offers = 0
+        self.error_count = 0
+        self.errors = []
+
+    @property
+    def ok(self):
+        return self.error_count == 0
+
+    def _add(self, number, identifier, path, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_details:
+            self.errors.append((number, identifier, path, message))
+
+    # Confere o envelope (tudo o que vem antes de "ofertas")
+    def check_envelope(self, envelope):
+        if type(envelope.get("dataUltimaAtualizacaoArquivo")) is not str:
+            self._add(0, None, "dataUltimaAtualizacaoArquivo",
+                      _type_error("texto", envelope.get("dataUltimaAtualizacaoArquivo", _MISSING)))
+        cnpj = envelope.get("cnpj")
+        if not isinstance(cnpj, dict) or type(cnpj.get("cnpj")) is not str:
+            self._add(0, None, "cnpj.cnpj", "esperado texto com o CNPJ da operadora")
+
+    # Confere uma oferta; retorna True quando ela está no layout
+    def check(self, offer):
+        self.offers += 1
+        found = self.validate_offer(offer)
+        if not found:
+            return True
+        self.invalid_offers += 1
+        identifier = offer.get("identificadorUnico") if isinstance(offer, dict) else None
+        for path, message in found:
+            self._add(self.offers, identifier, path, message)
+        return False
+
+    # Gera as mesmas ofertas, conferindo cada uma ao passar
+    # Com profiler (ver instrumentation) a conferência é medida como etapa "validate"
+    def iterate(self, offers, profiler=None):
+        check = self.check if profiler is None else profiler.wrap("validate", self.check)
+        for offer in offers:
+            check(offer)
+            yield offer
+
+    # Texto com o resumo e os primeiros erros, para a linha de comando
+    def format(self, limit=20):
+        if self.ok:
+            return f"validação: {self.offers} ofertas no layout da Anatel"
+        lines = [f"validação: {self.error_count} erros em {self.invalid_offers} de "
+                 f"{self.offers} ofertas"]
+        shown = self.errors[:limit]
+        for number, identifier, path, message in shown:
+            where = "envelope" if number == 0 else f"oferta {number} (identificadorUnico={identifier!r})"
+            lines.append(f"  {where}: {path or '(objeto)'}: {message}")
+        # Inclui os erros não guardados (além de max_details), não só os além do limite
+        if self.error_count > len(shown):
+            lines.append(f"  ... e mais {self.error_count - len(shown)} erros")
+        return "\n".join(lines)
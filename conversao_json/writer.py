@@ -0,0 +1,252 @@
+import os
+import uuid
+from contextlib import contextmanager
+from functools import lru_cache
+
+from .compression import open_output
+from .interning import SHARED_TYPES
+from .serializers import get_serializer
+
+
+# Codificador de ofertas que reaproveita o texto dos blocos e listas grandes
+# compartilhados (ver interning): cada um é codificado uma vez e o texto guardado
+# nele é copiado para as ofertas seguintes. Os demais campos, entre um bloco e
+# outro, são codificados juntos numa única chamada ao serializador.
+# Ofertas sem blocos compartilhados são codificadas de uma vez, como antes
+class OfferEncoder:
+    def __init__(self, serializer, depth=2):
+        self.serializer = serializer
+        self.depth = depth
+        indent = serializer.indent
+        if indent is None:
+            self._item_prefix, self._key_sep, self._close = "", ":", "}"
+        else:
+            self._item_prefix = "\n" + " " * (indent * (depth + 1))
+            self._key_sep = ": "
+            self._close = "\n" + " " * (indent * depth) + "}"
+        self._fragment_key = (serializer, depth + 1)
+        self._keys = {}
+
+    def _fields(self, fields):
+        # Texto dos campos sem as chaves do objeto, para ser emendado aos blocos
+        return self.serializer.dumps(fields, self.depth)[1:-len(self._close)]
+
+    def _shared(self, key, value):
+        fragment = value.fragments.get(self._fragment_key)
+        if fragment is None:
+            fragment = value.fragments[self._fragment_key] = self.serializer.dumps(value, self.depth + 1)
+        name = self._keys.get(key)
+        if name is None:
+            name = self._keys[key] = self._item_prefix + self.serializer.dumps(key) + self._key_sep
+        return name + fragment
+
+    def encode(self, offer):
+        parts = []
+        fields = {}
+        for key, value in offer.items():
+            if type(value) in SHARED_TYPES:
+                if fields:
+                    parts.append(self._fields(fields))
+                    fields = {}
+                parts.append(self._shared(key, value))
+            else:
+                fields[key] = value
+        if not parts:
+            return self.serializer.dumps(offer, self.depth)
+        if fields:
+            parts.append(self._fields(fields))
+        return "{" + ",".join(parts) + self._close
+
+
+# Função para obter o codificador de ofertas de uma configuração de saída
+@lru_cache(maxsize=16)
+def get_offer_encoder(indent=4, ensure_ascii=False, backend="auto"):
+    return OfferEncoder(get_serializer(indent, ensure_ascii, backend))
+
+
+# Função para codificar uma oferta já com o recuo de item do array "ofertas"
+def encode_offer(offer, indent=4, ensure_ascii=False, backend="auto"):
+    return get_offer_encoder(indent, ensure_ascii, backend).encode(offer)
+
+
+# Escritor incremental do JSON de ofertas
+# O envelope (dataUltimaAtualizacaoArquivo, cnpj, ...) é escrito primeiro e
+# cada oferta é gravada assim que é construída, sem montar a árvore inteira
+# em memória. Com indent=4 e o backend "json" o texto é idêntico ao de
+# json.dump(..., indent=4) (com o orjson, ver serializers.OrjsonSerializer);
+# com indent=None a saída é compacta (sem quebras de linha nem espaços).
+class OffersJsonWriter:
+    def __init__(self, fp, envelope, indent=4, ensure_ascii=False, backend="auto"):
+        self.fp = fp
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.serializer = get_serializer(indent, ensure_ascii, backend)
+        self.encoder = get_offer_encoder(indent, ensure_ascii, backend)
+        self.count = 0
+        self.closed = False
+
+        if indent is None:
+            self._newline, self._item_sep, self._key_sep = "", ",", ":"
+            self._item_prefix = ""
+        else:
+            self._newline, self._item_sep, self._key_sep = "\n", ",", ": "
+            self._item_prefix = "\n" + " " * (2 * indent)
+
+        pad = "" if indent is None else " " * indent
+        dumps = self.serializer.dumps
+        parts = ["{"]
+        for key, value in envelope.items():
+            parts.append(f"{self._newline}{pad}{dumps(key)}{self._key_sep}{dumps(value, depth=1)}{self._item_sep}")
+        parts.append(f"{self._newline}{pad}{dumps('ofertas')}{self._key_sep}[")
+        self.fp.write("".join(parts))
+
+    # Grava uma oferta no array "ofertas"
+    def write_offer(self, offer):
+        self.write_encoded(self.encoder.encode(offer))
+
+    # Grava uma oferta já codificada por encode_offer (ex.: vinda de outro processo)
+    def write_encoded(self, encoded):
+        separator = self._item_sep if self.count else ""
+        self.fp.write(f"{separator}{self._item_prefix}{encoded}")
+        self.count += 1
+
+    # Fecha o array e o objeto principal
+    def close(self):
+        if self.closed:
+            return
+        if self.count and self.indent is not None:
+            self.fp.write("\n" + " " * self.indent + "]")
+        else:
+            self.fp.write("]")
+        self.fp.write(self._newline + "}")
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+# Função para o caminho temporário de uma saída, no mesmo diretório do destino
+# (o os.replace final precisa estar no mesmo sistema de arquivos)
+def temp_output_path(path):
+    return f"{path}.{uuid.uuid4().hex[:12]}.tmp"
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+# Arquivo de saída gravado de forma atômica, como em cache.ConversionCache.put: o
+# texto vai para um arquivo temporário ao lado do destino, que só substitui o
+# destino (os.replace) quando tudo foi gravado. Se a conversão falhar no meio, o
+# temporário é apagado e o JSON anterior continua intacto
+@contextmanager
+def atomic_output(path, compression=None, level=None):
+    temp_path = temp_output_path(path)
+    try:
+        with open_output(temp_path, compression, level) as output:
+            yield output
+    except BaseException:
+        _discard(temp_path)
+        raise
+    os.replace(temp_path, path)
+
+
+# Função para gravar o JSON de ofertas em arquivo, consumindo as ofertas aos poucos
+# compression ("gzip" ou "zstd", ver compression) comprime o texto enquanto é gravado
+# Com profiler (ver instrumentation) a gravação é medida como etapa "serialize"
+def write_offers_json(json_path, envelope, offers, indent=4, ensure_ascii=False, backend="auto",
+                      profiler=None, compression=None, level=None):
+    with atomic_output(json_path, compression, level) as json_file:
+        with OffersJsonWriter(json_file, envelope, indent, ensure_ascii, backend) as writer:
+            write_offer = writer.write_offer
+            if profiler is not None:
+                write_offer = profiler.wrap("serialize", write_offer)
+            for offer in offers:
+                write_offer(offer)
+        count = writer.count
+    if profiler is not None:
+        profiler.record("serialize", 0.0, nbytes=os.path.getsize(json_path))
+    return count
+
+
+# Escritor de vários JSON de ofertas numa única passada, um por grupo (ex.: por CNPJ)
+# Cada grupo tem o próprio OffersJsonWriter, aberto quando aparece a primeira oferta
+# do grupo; as ofertas são gravadas assim que chegam, em qualquer ordem, então a
+# memória não cresce com o tamanho da planilha (só um arquivo aberto por grupo).
+# path_for(chave) e envelope_for(chave) dão o caminho e o envelope de cada grupo;
+# compression e level valem para todos os arquivos (ver write_offers_json).
+# Cada arquivo é gravado num temporário (ver atomic_output) que só substitui o
+# destino no close(); se a conversão falhar, os temporários são apagados.
+class SplitOffersWriter:
+    def __init__(self, path_for, envelope_for, indent=4, ensure_ascii=False, backend="auto",
+                 compression=None, level=None):
+        self.path_for = path_for
+        self.envelope_for = envelope_for
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.backend = backend
+        self.compression = compression
+        self.level = level
+        self.writers = {}
+        self.paths = {}
+        self._files = []
+        self._temp_paths = {}
+        self.closed = False
+
+    def _open(self, key):
+        path = self.paths[key] = self.path_for(key)
+        temp_path = self._temp_paths[key] = temp_output_path(path)
+        json_file = open_output(temp_path, self.compression, self.level)
+        self._files.append(json_file)
+        writer = self.writers[key] = OffersJsonWriter(json_file, self.envelope_for(key), self.indent,
+                                                      self.ensure_ascii, self.backend)
+        return writer
+
+    # Grava uma oferta no JSON do grupo `key`
+    def write_offer(self, key, offer):
+        writer = self.writers.get(key)
+        if writer is None:
+            writer = self._open(key)
+        writer.write_offer(offer)
+
+    # Quantidade de ofertas gravadas em cada grupo
+    @property
+    def counts(self):
+        return {key: writer.count for key, writer in self.writers.items()}
+
+    # Fecha os arrays e os arquivos e os move para o destino
+    # finish=False (conversão com erro) descarta os arquivos, sem tocar nos destinos
+    def close(self, finish=True):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            try:
+                if finish:
+                    for writer in self.writers.values():
+                        writer.close()
+            finally:
+                for json_file in self._files:
+                    json_file.close()
+        except BaseException:
+            finish = False
+            raise
+        finally:
+            for key, temp_path in self._temp_paths.items():
+                if finish:
+                    os.replace(temp_path, self.paths[key])
+                else:
+                    _discard(temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(finish=exc_type is None)
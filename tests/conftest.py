@@ -0,0 +1,30 @@
+import csv
+
+import pytest
+
+# Colunas do layout usadas nas planilhas de teste (um grupo repetido e uma coluna LIST)
+HEADER = (
+    "cnpj", "identificadorUnico", "nomeOferta", "areasAbrangencia", "precoSemDescontos",
+    "descricaoPromocao", "tempoDesconto", "descontoPromocao",
+)
+
+
+def offer_row(number, cnpj="11.111.111/0001-11", name=None):
+    return (cnpj, f"OF{number:04d}", name or f"Oferta {number}", "3550308, 3304557",
+            f"{number}.90", f"promo {number % 3}", "12", "10%")
+
+
+# Fábrica de planilhas CSV de ofertas: offers_csv("a.csv", rows) grava o arquivo em
+# tmp_path e retorna o caminho; sem rows grava `count` ofertas numeradas
+@pytest.fixture
+def offers_csv(tmp_path):
+    def write(name="ofertas.csv", rows=None, count=30, header=HEADER):
+        path = tmp_path / name
+        if rows is None:
+            rows = [offer_row(number) for number in range(count)]
+        with open(path, "w", encoding="utf-8", newline="") as sheet:
+            writer = csv.writer(sheet)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return str(path)
+    return write
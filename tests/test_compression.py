@@ -0,0 +1,95 @@
+import gzip
+import io
+import zipfile
+from importlib.util import find_spec
+
+import pytest
+
+from conversao_json import (
+    compress_bytes, compression_for, generate_json_archive, generate_json_bytes, generate_json_from_excel,
+    generate_json_parallel,
+)
+from conversao_json.compression import compressed_path, split_compressed_path
+
+
+def _decompress(data, compression):
+    if compression == "gzip":
+        return gzip.decompress(data)
+    import zstandard
+
+    return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)).read()
+
+
+def _read(path):
+    with open(path, "rb") as output:
+        return output.read()
+
+
+# zstd só quando o pacote opcional zstandard estiver instalado
+COMPRESSION_PARAMS = ["gzip", pytest.param("zstd", marks=pytest.mark.skipif(
+    find_spec("zstandard") is None, reason="zstandard não instalado"))]
+
+
+@pytest.mark.parametrize("compression", COMPRESSION_PARAMS)
+def test_compressed_file_round_trip(offers_csv, tmp_path, compression):
+    sheet = offers_csv(count=15)
+    plain, packed = str(tmp_path / "saida.json"), compressed_path(str(tmp_path / "saida.json"), compression)
+
+    generate_json_from_excel(sheet, plain)
+    assert generate_json_from_excel(sheet, packed, compression=compression, level=1) == 15
+    assert compression_for(packed) == compression
+    assert _decompress(_read(packed), compression) == _read(plain)
+
+
+@pytest.mark.parametrize("compression", COMPRESSION_PARAMS)
+def test_compressed_bytes_and_parallel_round_trip(offers_csv, tmp_path, compression):
+    sheet = offers_csv(count=15)
+    plain = generate_json_bytes(sheet)
+    assert _decompress(generate_json_bytes(sheet, compression=compression), compression) == plain
+    assert _decompress(compress_bytes(plain, compression), compression) == plain
+
+    packed = compressed_path(str(tmp_path / "paralelo.json"), compression)
+    generate_json_parallel(sheet, packed, workers=2, chunksize=4, compression=compression)
+    assert _decompress(_read(packed), compression) == plain
+
+
+def test_unknown_compression_is_rejected(offers_csv, tmp_path):
+    with pytest.raises(ValueError, match="compressão desconhecida"):
+        generate_json_from_excel(offers_csv(), str(tmp_path / "saida.json.xz"), compression="xz")
+    assert split_compressed_path("saida.json.gz") == ("saida.json", ".gz")
+    assert split_compressed_path("saida.json") == ("saida.json", "")
+
+
+def test_archive_round_trip(offers_csv, tmp_path):
+    sheets = [offers_csv("a.csv", count=4), offers_csv("b.csv", count=9)]
+    archive_path = str(tmp_path / "lote.zip")
+
+    assert generate_json_archive([(sheets[0], "a.json"), (sheets[1], "b.json")], archive_path, level=9) == [4, 9]
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["a.json", "b.json"]
+        assert all(info.date_time[0] > 1980 for info in archive.infolist())
+        for sheet, name in zip(sheets, archive.namelist()):
+            assert archive.read(name) == generate_json_bytes(sheet)
+
+
+def test_archive_level_is_applied(offers_csv, tmp_path):
+    sheet = offers_csv(count=200)
+    sizes = []
+    for level in (0, 9):
+        archive_path = str(tmp_path / f"nivel_{level}.zip")
+        generate_json_archive([(sheet, "a.json")], archive_path, level=level)
+        sizes.append(zipfile.ZipFile(archive_path).infolist()[0].compress_size)
+    assert sizes[1] < sizes[0]
+
+
+def test_failed_archive_keeps_previous_file(offers_csv, tmp_path):
+    sheet = offers_csv(count=3)
+    archive_path = str(tmp_path / "lote.zip")
+    generate_json_archive([(sheet, "a.json")], archive_path)
+    previous = _read(archive_path)
+
+    with pytest.raises(OSError):
+        generate_json_archive([(sheet, "a.json"), (str(tmp_path / "ausente.csv"), "b.json")], archive_path)
+    assert _read(archive_path) == previous
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["lote.zip", "ofertas.csv"]
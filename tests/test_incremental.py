@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from conversao_json import generate_json_from_excel, generate_json_incremental
+from conversao_json import incremental
+
+from conftest import HEADER, offer_row
+
+
+def _read(path):
+    with open(path, "rb") as output:
+        return output.read()
+
+
+def test_second_run_reuses_every_offer(offers_csv, tmp_path):
+    sheet = offers_csv(count=10)
+    json_path, serial = str(tmp_path / "inc.json"), str(tmp_path / "serial.json")
+
+    assert generate_json_incremental(sheet, json_path) == {"offers": 10, "rebuilt": 10, "reused": 0}
+    assert generate_json_incremental(sheet, json_path) == {"offers": 10, "rebuilt": 0, "reused": 10}
+    generate_json_from_excel(sheet, serial)
+    assert _read(json_path) == _read(serial)
+    assert os.path.exists(json_path + incremental.STATE_SUFFIX)
+
+
+def test_changed_row_is_rebuilt(offers_csv, tmp_path):
+    json_path, serial = str(tmp_path / "inc.json"), str(tmp_path / "serial.json")
+    generate_json_incremental(offers_csv(count=10), json_path)
+
+    rows = [offer_row(number) for number in range(10)]
+    rows[4] = offer_row(4, name="Oferta alterada")
+    sheet = offers_csv(rows=rows)
+    assert generate_json_incremental(sheet, json_path) == {"offers": 10, "rebuilt": 1, "reused": 9}
+    generate_json_from_excel(sheet, serial)
+    assert _read(json_path) == _read(serial)
+
+
+def test_columns_outside_the_layout_do_not_rebuild(offers_csv, tmp_path):
+    json_path = str(tmp_path / "inc.json")
+    header = HEADER + ("colunaInterna",)
+    generate_json_incremental(offers_csv(rows=[offer_row(n) + ("a",) for n in range(5)], header=header),
+                              json_path)
+
+    sheet = offers_csv(rows=[offer_row(n) + ("b",) for n in range(5)], header=header)
+    assert generate_json_incremental(sheet, json_path)["reused"] == 5
+
+
+def test_formatting_and_schema_changes_invalidate_the_state(offers_csv, tmp_path, monkeypatch):
+    sheet = offers_csv(count=5)
+    json_path = str(tmp_path / "inc.json")
+    generate_json_incremental(sheet, json_path)
+
+    assert generate_json_incremental(sheet, json_path, indent=None)["rebuilt"] == 5
+    monkeypatch.setattr(incremental, "SCHEMA_VERSION", incremental.SCHEMA_VERSION + 1)
+    assert generate_json_incremental(sheet, json_path, indent=None)["rebuilt"] == 5
+
+
+def test_failed_run_keeps_previous_output_and_state(offers_csv, tmp_path, monkeypatch):
+    sheet = offers_csv(count=5)
+    json_path = str(tmp_path / "inc.json")
+    generate_json_incremental(sheet, json_path)
+    output = _read(json_path)
+
+    def fail(row):
+        raise RuntimeError("falha no meio da conversão")
+
+    monkeypatch.setattr(incremental, "row_fingerprint", fail)
+    with pytest.raises(RuntimeError):
+        generate_json_incremental(sheet, json_path)
+    monkeypatch.undo()
+
+    assert _read(json_path) == output
+    assert sorted(os.listdir(tmp_path)) == ["inc.json", "inc.json.state", "ofertas.csv"]
+    assert generate_json_incremental(sheet, json_path)["reused"] == 5
@@ -0,0 +1,46 @@
+import json
+
+from conversao_json import generate_json_bytes, generate_json_incremental, get_builder, split_list
+
+HEADER = ("identificadorUnico", "quantidade", "valor", "compartilhamento")
+
+
+def _dependentes(offer):
+    return json.dumps(offer["SMP"]["dependentes"])
+
+
+# 1, 1.0 e True são a mesma chave de dicionário, mas não o mesmo JSON
+def test_interned_blocks_keep_cell_types():
+    build_offer = get_builder(HEADER, coerce=False, intern=True)
+    plain = get_builder(HEADER, coerce=False)
+    for quantidade in (1, 1.0, True, "1"):
+        row = ("A", quantidade, "10", "sim")
+        assert _dependentes(build_offer(row)) == _dependentes(plain(row))
+
+
+# Cada conversão tem as próprias tabelas de blocos
+def test_builders_do_not_share_blocks():
+    row = ("A", 1, "10", "sim")
+    first = get_builder(HEADER, coerce=False, intern=True)(row)
+    second = get_builder(HEADER, coerce=False, intern=True)(row)
+    assert first["SMP"]["dependentes"] is not second["SMP"]["dependentes"]
+
+
+# Células com lista (ex.: list<string> do Parquet) não quebram o interning
+def test_list_cells_are_interned_or_built():
+    assert split_list(["a", "b"]) == ("a", "b")
+    build_offer = get_builder(HEADER, coerce=False, intern=True)
+    offer = build_offer(("A", ["x"], "10", "sim"))
+    assert offer["SMP"]["dependentes"]["quantidade"] == ["x"]
+
+
+def test_serial_and_incremental_agree_on_numeric_cells(tmp_path):
+    csv_path = tmp_path / "ofertas.csv"
+    csv_path.write_text("identificadorUnico,quantidade,valor\nA,1,10\nB,1.0,10\n", encoding="utf-8")
+    json_path = tmp_path / "ofertas.json"
+    generate_json_incremental(str(csv_path), str(json_path))
+    serial = json.loads(generate_json_bytes(str(csv_path)))
+    incremental = json.loads(json_path.read_bytes())
+    quantities = [offer["SMP"]["dependentes"]["quantidade"] for offer in serial["ofertas"]]
+    assert [repr(value) for value in quantities] == ["1", "1.0"]
+    assert serial == incremental
@@ -0,0 +1,45 @@
+from conversao_json import generate_json_from_excel, generate_json_many, generate_json_parallel
+
+
+def _read(path):
+    with open(path, "rb") as output:
+        return output.read()
+
+
+def test_parallel_output_matches_serial(offers_csv, tmp_path):
+    sheet = offers_csv(count=50)
+    serial, parallel = str(tmp_path / "serial.json"), str(tmp_path / "parallel.json")
+
+    assert generate_json_from_excel(sheet, serial) == 50
+    # Blocos pequenos: várias tarefas por processo, devolvidas fora de ordem
+    assert generate_json_parallel(sheet, parallel, workers=2, chunksize=7) == 50
+    assert _read(parallel) == _read(serial)
+
+
+def test_parallel_compact_output_matches_serial(offers_csv, tmp_path):
+    sheet = offers_csv(count=20)
+    serial, parallel = str(tmp_path / "serial.json"), str(tmp_path / "parallel.json")
+
+    generate_json_from_excel(sheet, serial, indent=None)
+    generate_json_parallel(sheet, parallel, workers=2, chunksize=3, indent=None)
+    assert _read(parallel) == _read(serial)
+
+
+def test_many_matches_serial_per_file(offers_csv, tmp_path):
+    sheets = [offers_csv("a.csv", count=5), offers_csv("b.csv", count=12)]
+    jobs = [(sheet, str(tmp_path / f"many_{number}.json")) for number, sheet in enumerate(sheets)]
+
+    assert generate_json_many(jobs, workers=2) == [5, 12]
+    for sheet, json_path in jobs:
+        serial = json_path + ".serial"
+        generate_json_from_excel(sheet, serial)
+        assert _read(json_path) == _read(serial)
+
+
+def test_many_reports_failures_in_place(offers_csv, tmp_path):
+    jobs = [(offers_csv(count=3), str(tmp_path / "ok.json")),
+            (str(tmp_path / "ausente.csv"), str(tmp_path / "ausente.json"))]
+
+    results = generate_json_many(jobs, workers=2, return_exceptions=True)
+    assert results[0] == 3
+    assert isinstance(results[1], OSError)
@@ -0,0 +1,35 @@
+from conversao_json import REPEATED_GROUPS, get_builder
+from conversao_json.plan import resolve_group
+
+# Trecho do cabeçalho do modelo da Anatel: "tempoDesconto" aparece na fidelização e
+# de novo nas promoções, onde é lido como "tempoDesconto.1"
+HEADER = (
+    "identificadorUnico", "tempoFidelizacao", "descontoFidelizacao", "tempoDesconto",
+    "beneficioFidelizacao", "multaFidelizacao", "formaPagamento", "descontoPagamento",
+    "descricaoPromocao", "tempoDesconto.1", "descontoPromocao",
+)
+
+
+def test_duplicate_column_is_bound_to_its_own_group():
+    columns = resolve_group(HEADER, REPEATED_GROUPS["listaPromocoes"])
+    assert columns == (("descricaoPromocao", "tempoDesconto.1", "descontoPromocao"),)
+
+
+def test_promotion_and_loyalty_read_different_cells():
+    build_offer = get_builder(HEADER)
+    offer = build_offer(("A", "12", "10%", "FIDELIZACAO", "b", "m", "boleto", "0",
+                         "promo", "PROMOCAO", "5%"))
+    assert offer["fidelizacao"]["tempoDesconto"] == "FIDELIZACAO"
+    assert offer["listaPromocoes"] == [
+        {"descricaoPromocao": "promo", "tempoDesconto": "PROMOCAO", "descontoPromocao": "5%"},
+    ]
+
+
+def test_numbered_repetitions_keep_suffix_order():
+    header = ("formaPagamento1", "descontoPagamento1", "formaPagamento10", "descontoPagamento10",
+              "formaPagamento2", "descontoPagamento2")
+    assert resolve_group(header, REPEATED_GROUPS["formasPagamento"]) == (
+        ("formaPagamento1", "descontoPagamento1"),
+        ("formaPagamento2", "descontoPagamento2"),
+        ("formaPagamento10", "descontoPagamento10"),
+    )
@@ -0,0 +1,22 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from conversao_json import OFFERS_SHEET, iter_sheet_rows
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def test_xlsx_date_and_time_cells_become_text(tmp_path):
+    path = tmp_path / "ofertas.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = OFFERS_SHEET
+    sheet.append(["identificadorUnico", "dataInicioOferta", "notasExtras", "duracao", "atualizacao"])
+    sheet.append(["A", date(2024, 3, 1), time(10, 30), timedelta(hours=36, minutes=30),
+                  datetime(2024, 3, 1, 8, 0)])
+    sheet["D2"].number_format = "[h]:mm"
+    workbook.save(path)
+
+    rows = list(iter_sheet_rows(str(path)))
+    assert rows[1:] == [("A", "01/03/2024", "10:30:00", "36:30:00", "01/03/2024")]
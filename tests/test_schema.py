@@ -0,0 +1,31 @@
+from conversao_json import get_builder, required_columns, split_list
+
+
+def test_split_list_text():
+    assert split_list("a, b ,c") == ("a", "b", "c")
+    assert split_list("") == ()
+
+
+def test_split_list_scalar_becomes_single_text_item():
+    assert split_list(3550308) == ("3550308",)
+    assert split_list(3550308.0) == ("3550308",)
+    assert split_list(None) == ()
+    assert split_list(["a", "b"]) == ("a", "b")
+
+
+def test_numeric_list_cell_is_built_as_list():
+    build_offer = get_builder(("identificadorUnico", "areasAbrangencia"))
+    assert build_offer(("A", 3550308))["areasAbrangencia"] == ("3550308",)
+
+
+def test_smp_reads_repeated_franchise_condition_column():
+    header = ("identificadorUnico", "condicoesAposConsumoFranquia", "condicoesAposConsumoFranquia.1")
+    assert required_columns(header) == header
+    offer = get_builder(header)(("A", "STFC", "SMP"))
+    assert offer["STFC"]["condicoesAposConsumoFranquia"] == "STFC"
+    assert offer["SMP"]["condicoesAposConsumoFranquia"] == "SMP"
+
+
+def test_smp_franchise_condition_falls_back_to_single_column():
+    offer = get_builder(("identificadorUnico", "condicoesAposConsumoFranquia"))(("A", "única"))
+    assert offer["SMP"]["condicoesAposConsumoFranquia"] == "única"
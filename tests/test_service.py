@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from conversao_json import generate_json_from_excel
+from conversao_json.service import ConversionService
+
+
+# Cliente HTTP mínimo: uma requisição por conexão, como o serviço atende
+async def _request(port, method, target, body=b"", headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"{method} {target} HTTP/1.1", "Host: 127.0.0.1"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), content
+
+
+async def _upload(port, data, query="filename=ofertas.csv"):
+    return await _request(port, "POST", f"/jobs?{query}", data, {"Content-Length": len(data)})
+
+
+# Executa `scenario(service, port)` com o serviço escutando numa porta livre
+def _run(tmp_path, scenario, **options):
+    async def main():
+        service = ConversionService(workers=1, directory=str(tmp_path / "jobs"), **options)
+        await service.start()
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        try:
+            return await scenario(service, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+    return asyncio.run(main())
+
+
+def test_job_result_matches_direct_conversion(offers_csv, tmp_path):
+    sheet = offers_csv(count=8)
+    with open(sheet, "rb") as upload:
+        data = upload.read()
+
+    async def scenario(service, port):
+        status, body = await _upload(port, data)
+        assert status == 202
+        job_id = json.loads(body)["id"]
+        status, result = await _request(port, "GET", f"/jobs/{job_id}/result?wait=1")
+        assert status == 200
+        status, body = await _request(port, "GET", f"/jobs/{job_id}")
+        assert json.loads(body)["offers"] == 8
+        status, body = await _request(port, "DELETE", f"/jobs/{job_id}")
+        assert status == 200
+        status, _ = await _request(port, "GET", f"/jobs/{job_id}")
+        assert status == 404
+        return result
+
+    result = _run(tmp_path, scenario)
+    expected = str(tmp_path / "direto.json")
+    generate_json_from_excel(sheet, expected)
+    with open(expected, "rb") as direct:
+        assert result == direct.read()
+
+
+def test_failed_conversion_is_reported(tmp_path):
+    async def scenario(service, port):
+        status, body = await _upload(port, b"nada de planilha", "filename=x.xlsx")
+        job_id = json.loads(body)["id"]
+        result = await _request(port, "GET", f"/jobs/{job_id}/result?wait=1")
+        job = await _request(port, "GET", f"/jobs/{job_id}")
+        return result, json.loads(job[1])
+
+    (status, body), job = _run(tmp_path, scenario)
+    assert status == 500
+    assert "a conversão falhou" in json.loads(body)["error"]
+    assert job["status"] == "failed" and job["error"]
+
+
+def test_invalid_requests_are_rejected(tmp_path):
+    async def scenario(service, port):
+        return [
+            (await _request(port, "POST", "/jobs", b"abc"))[0],
+            (await _request(port, "POST", "/jobs", b"abc", {"Content-Length": "-3"}))[0],
+            (await _upload(port, b"abc", "filename=x.txt"))[0],
+            (await _upload(port, b"x" * 64))[0],
+            (await _request(port, "GET", "/jobs/inexistente"))[0],
+            (await _request(port, "PUT", "/status"))[0],
+        ]
+
+    assert _run(tmp_path, scenario, max_upload_bytes=32) == [411, 400, 400, 413, 404, 405]
+
+
+def test_status_reports_limits(tmp_path):
+    async def scenario(service, port):
+        status, body = await _request(port, "GET", "/status")
+        return status, json.loads(body)
+
+    status, body = _run(tmp_path, scenario, max_queue=3)
+    assert status == 200
+    assert body == {"queue": 0, "max_queue": 3, "running": 0, "workers": 1, "jobs": 0}
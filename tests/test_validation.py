@@ -0,0 +1,74 @@
+import copy
+
+from conversao_json import (
+    ValidationReport, build_envelope, convert_offers, generate_json_from_excel, get_builder, get_validator,
+)
+
+HEADER = ("identificadorUnico", "codigoOferta", "areasAbrangencia", "descricaoPromocao", "tempoDesconto",
+          "descontoPromocao")
+
+
+def _offer():
+    # Cópia simples (sem blocos compartilhados), para poder ser alterada no teste
+    offer = get_builder(HEADER)(("A", "C1", "1, 2", "promo", "12", "5%"))
+    return copy.deepcopy(offer)
+
+
+def test_built_offers_are_valid(offers_csv, tmp_path):
+    report = ValidationReport()
+    generate_json_from_excel(offers_csv(count=12), str(tmp_path / "saida.json"), report=report)
+    assert report.ok
+    assert report.offers == 12
+    assert "12 ofertas no layout" in report.format()
+
+
+def test_interned_offers_are_valid(offers_csv):
+    report = ValidationReport()
+    envelope, offers = convert_offers(offers_csv(count=12))
+    report.check_envelope(envelope)
+    assert len(list(report.iterate(offers))) == 12
+    assert report.ok
+
+
+def test_type_errors_are_reported_with_their_path():
+    offer = _offer()
+    offer["codigoOferta"] = 10
+    offer["areasAbrangencia"] = [1]
+    offer["custoInicial"]["adesao"] = None
+    offer["listaPromocoes"][0]["extra"] = "x"
+    errors = dict(get_validator()(offer))
+    assert errors["codigoOferta"] == "esperado texto, recebido int"
+    assert errors["areasAbrangencia"] == "esperado lista de textos, com item int"
+    assert errors["custoInicial.adesao"] == "esperado texto, recebido NoneType"
+    assert errors["listaPromocoes"] == "chaves inesperadas: 'extra'"
+
+
+def test_missing_and_extra_keys_are_reported():
+    offer = _offer()
+    del offer["STFC"]["listaPUC"]
+    offer["campoNovo"] = ""
+    errors = dict(get_validator()(offer))
+    assert errors[""] == "chaves inesperadas: 'campoNovo'"
+    assert errors["STFC"] == "chaves ausentes: 'listaPUC'"
+    assert errors["STFC.listaPUC"] == "esperado lista de textos, recebido nenhum valor (campo ausente)"
+
+
+def test_report_counts_every_error_but_keeps_max_details():
+    report = ValidationReport(max_details=1)
+    report.check_envelope({"cnpj": "111"})
+    offer = _offer()
+    offer["codigoOferta"] = 10
+    assert report.check(_offer())
+    assert not report.check(offer)
+
+    assert (report.offers, report.invalid_offers, report.error_count) == (2, 1, 3)
+    assert report.errors == [(0, None, "dataUltimaAtualizacaoArquivo",
+                              "esperado texto, recebido nenhum valor (campo ausente)")]
+    assert "oferta 2" not in report.format()
+    assert "e mais 2 erros" in report.format()
+
+
+def test_envelope_from_build_envelope_is_valid():
+    report = ValidationReport()
+    report.check_envelope(build_envelope("11.111.111/0001-11"))
+    assert report.ok